@@ -9,26 +9,82 @@ Requirements:
 - requests
 - markdownify
 - beautifulsoup4
+- lxml
+- orjson (optional, speeds up decoding of large API responses)
 
-Install with: pip install requests markdownify beautifulsoup4
+Install with: pip install requests markdownify beautifulsoup4 lxml
 
 Usage:
 python confluence_to_md.py --url <confluence_page_url> --output <output_folder> [--token <api_token>] [--username <username>] [--password <password>]
 """
 
 import argparse
+import hashlib
 import os
 import sys
 import re
 import json
+import shutil
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
 from markdownify import markdownify
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters kept in downloaded file names and in the markdown file name
+_FILENAME_SANITIZE = re.compile(r'[^\w\s.-]')
+_TITLE_SANITIZE = re.compile(r'[^\w\s-]')
+
+# Runs of blank lines collapsed in the generated markdown
+_MULTI_NEWLINE = re.compile(r'\n\s*\n\s*\n')
+
+# Confluence storage-format elements dropped, or turned into <div>s with a class
+_CONFLUENCE_STRIP_TAGS = frozenset({'ac:structured-macro', 'ac:parameter', 'ri:attachment'})
+_CONFLUENCE_LAYOUT_CLASSES = {'ac:layout-section': 'section', 'ac:layout-cell': 'column'}
+
+# Tags rendered directly to Markdown; any other tag falls back to markdownify
+_MD_HEADINGS = {'h1': '#', 'h2': '##', 'h3': '###', 'h4': '####', 'h5': '#####', 'h6': '######'}
+_MD_BLOCK_TAGS = frozenset({'p', 'div', 'section'})
+_MD_CONTAINER_TAGS = frozenset({'html', 'body', 'span', 'thead', 'tbody', 'tfoot', 'tr', 'th', 'td'})
+_MD_TAGS = _MD_BLOCK_TAGS | _MD_CONTAINER_TAGS | _MD_HEADINGS.keys() | {
+    'ul', 'ol', 'li', 'a', 'img', 'code', 'pre', 'table',
+    'strong', 'b', 'em', 'i', 'br', 'hr',
+}
+
+# Whitespace collapsed, and Markdown characters escaped, in text nodes
+_MD_WHITESPACE = re.compile(r'[\t \r\n]+')
+_MD_ESCAPE = re.compile(r'([*_])')
+
+# Compiled query for <img> elements with a non-empty src
+_IMG_WITH_SRC = etree.XPath('//img[@src != ""]')
+
+# Image file extensions kept as-is; other names get a .png extension
+_IMG_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'})
+
+# Number of images/attachments downloaded concurrently
+_DOWNLOAD_WORKERS = 10
+
+# Buffer size used when streaming downloads to disk
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Maps image src URLs to files already downloaded into an images folder
+_IMAGE_CACHE_FILE = '.cache.json'
+
+# Serializes progress messages printed from download threads
+_print_lock = threading.Lock()
+
 
 class ConfluenceToMarkdown:
     def __init__(self, base_url: str, auth: Optional[Tuple[str, str]] = None, token: Optional[str] = None):
@@ -42,6 +98,22 @@ class ConfluenceToMarkdown:
         """
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        self._image_cache: Dict[str, str] = {}
+        
+        # Page content saved per page version, so re-runs skip unchanged pages;
+        # each Confluence instance gets its own folder since page ids are per site
+        site_key = hashlib.blake2b(self.base_url.encode('utf-8'), digest_size=8).hexdigest()
+        self.cache_dir = Path.home() / '.cache' / 'confluence_to_md' / site_key
+        
+        # Keep enough pooled connections for the concurrent downloads and
+        # retry transient server errors
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         if token:
             self.session.headers.update({'Authorization': f'Bearer {token}'})
@@ -90,7 +162,7 @@ class ConfluenceToMarkdown:
         url = f"{self.base_url}/rest/api/content/{page_id}"
         response = self.session.get(url)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
         return data['space']['key']
 
     def _get_page_id_from_title(self, space_key: str, page_title: str) -> str:
@@ -103,15 +175,31 @@ class ConfluenceToMarkdown:
         }
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
         
         if not data['results']:
             raise ValueError(f"Page not found: {page_title} in space {space_key}")
         
         return data['results'][0]['id']
 
-    def get_page_content(self, page_id: str) -> Dict:
-        """Retrieve page content from Confluence API."""
+    def get_page_version(self, page_id: str) -> int:
+        """Retrieve the current version number of a page."""
+        url = f"{self.base_url}/rest/api/content/{page_id}"
+        params = {'expand': 'version'}
+        
+        response = self.session.get(url, params=params)
+        response.raise_for_status()
+        return _json_loads(response.content)['version']['number']
+
+    def get_page_content(self, page_id: str, version: Optional[int] = None) -> Dict:
+        """Retrieve page content from Confluence API, or from the cache if the version is unchanged."""
+        if version is None:
+            version = self.get_page_version(page_id)
+        cache_name = f"{page_id}-{version}.json"
+        cached = self._read_api_cache(cache_name)
+        if cached is not None:
+            return cached
+        
         url = f"{self.base_url}/rest/api/content/{page_id}"
         params = {
             'expand': 'body.storage,space,version,ancestors'
@@ -119,16 +207,36 @@ class ConfluenceToMarkdown:
         
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        page_data = _json_loads(response.content)
+        self._write_api_cache(cache_name, page_data)
+        return page_data
 
     def get_page_attachments(self, page_id: str) -> List[Dict]:
         """Get list of attachments for a page."""
+        # Not cached: uploading an attachment does not bump the page version
         url = f"{self.base_url}/rest/api/content/{page_id}/child/attachment"
         params = {'expand': 'version'}
         
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()['results']
+        return _json_loads(response.content)['results']
+
+    def _read_api_cache(self, cache_name: str):
+        """Load a cached API response, or return None if it is missing or unreadable."""
+        try:
+            with open(self.cache_dir / cache_name, 'rb') as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_api_cache(self, cache_name: str, data) -> None:
+        """Save an API response to the cache; a failed write only skips caching."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / cache_name, 'wb') as f:
+                f.write(_json_dumps(data))
+        except OSError:
+            pass
 
     def download_attachment(self, attachment: Dict, output_dir: Path) -> str:
         """Download an attachment and return the local filename."""
@@ -136,100 +244,135 @@ class ConfluenceToMarkdown:
         filename = attachment['title']
         
         # Sanitize filename
-        filename = re.sub(r'[^\w\s-.]', '', filename).strip()
+        filename = _FILENAME_SANITIZE.sub('', filename).strip()
         
         filepath = output_dir / filename
         
-        response = self.session.get(download_url)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
+        self._stream_to_file(download_url, filepath)
         
-        print(f"Downloaded attachment: {filename}")
+        _log(f"Downloaded attachment: {filename}")
         return filename
 
-    def download_image(self, img_url: str, output_dir: Path, img_name: str) -> str:
+    def download_image(self, img_url: str, output_dir: Union[str, Path], img_name: str) -> str:
         """Download an image and return the local filename."""
         # Handle relative URLs
         if img_url.startswith('/'):
             img_url = self.base_url + img_url
         
         # Sanitize filename
-        img_name = re.sub(r'[^\w\s-.]', '', img_name).strip()
-        if not img_name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')):
+        img_name = _FILENAME_SANITIZE.sub('', img_name).strip()
+        if os.path.splitext(img_name)[1].lower() not in _IMG_EXTS:
             img_name += '.png'  # Default extension
         
-        filepath = output_dir / img_name
+        filepath = os.path.join(output_dir, img_name)
         
         try:
-            response = self.session.get(img_url)
-            response.raise_for_status()
+            self._stream_to_file(img_url, filepath)
             
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            print(f"Downloaded image: {img_name}")
+            _log(f"Downloaded image: {img_name}")
             return img_name
         except Exception as e:
-            print(f"Failed to download image {img_url}: {e}")
+            _log(f"Failed to download image {img_url}: {e}")
             return img_url  # Return original URL if download fails
 
-    def process_images_in_html(self, html_content: str, images_dir: Path) -> str:
-        """Process images in HTML content and download them."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _stream_to_file(self, url: str, filepath: Union[str, Path]) -> None:
+        """Stream a download straight to disk instead of buffering it in memory."""
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            # Undo any Content-Encoding (gzip/deflate) so the file is stored as served
+            response.raw.decode_content = True
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, _DOWNLOAD_CHUNK_SIZE)
+
+    def process_images_in_html(self, tree: lxml_html.HtmlElement, images_dir: Path) -> Tuple[lxml_html.HtmlElement, int]:
+        """Process images in the parsed HTML tree, download them and return the tree and local image count."""
+        # Reuse images already downloaded into this folder, by this or a previous run
+        image_cache = self._image_cache = self._load_image_cache(images_dir)
         
+        images = []
+        pending = {}
         img_counter = 1
-        for img in soup.find_all('img'):
+        for img in _IMG_WITH_SRC(tree):
             src = img.get('src')
-            if not src:
-                continue
             
-            # Generate a filename for the image
-            alt_text = img.get('alt', f'image_{img_counter}')
-            img_name = f"{alt_text}_{img_counter}"
+            # Download each distinct image only once
+            if src not in image_cache and src not in pending:
+                # Generate a filename for the image; the src hash keeps it from
+                # colliding with images named by this or an earlier run
+                alt_text = img.get('alt', f'image_{img_counter}')
+                pending[src] = f"{alt_text}_{_src_digest(src)}"
             
-            # Download the image
-            local_filename = self.download_image(src, images_dir, img_name)
-            
-            # Update the src to point to local file
-            img['src'] = f"./images/{local_filename}"
+            images.append((img, src))
             img_counter += 1
         
-        return str(soup)
-
-    def clean_confluence_html(self, html_content: str) -> str:
-        """Clean Confluence-specific HTML elements."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Download the images concurrently
+        images_dir_str = os.fspath(images_dir)
+        download_image = self.download_image
+        with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS) as executor:
+            local_filenames = executor.map(
+                lambda item: download_image(item[0], images_dir_str, item[1]),
+                pending.items()
+            )
+            for src, local_filename in zip(pending, local_filenames):
+                if os.path.isfile(os.path.join(images_dir_str, local_filename)):
+                    image_cache[src] = local_filename
+                else:
+                    pending[src] = local_filename
         
-        # Remove Confluence-specific elements
-        for element in soup.find_all(['ac:structured-macro', 'ac:parameter', 'ri:attachment']):
-            element.decompose()
+        # Update each src to point to its local file
+        images_rel = './images/'
+        for img, src in images:
+            local_filename = image_cache.get(src) or pending[src]
+            img.set('src', images_rel + local_filename)
         
-        # Convert Confluence sections to proper HTML sections
-        for section in soup.find_all('ac:layout-section'):
-            section.name = 'div'
-            section['class'] = 'section'
+        self._save_image_cache(images_dir)
         
-        for column in soup.find_all('ac:layout-cell'):
-            column.name = 'div'
-            column['class'] = 'column'
+        images_count = len({src for _, src in images if src in image_cache})
+        return tree, images_count
+
+    def _load_image_cache(self, images_dir: Path) -> Dict[str, str]:
+        """Load the src -> filename map saved in images_dir, skipping missing files."""
+        cache_file = images_dir / _IMAGE_CACHE_FILE
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return {src: name for src, name in cache.items() if (images_dir / name).is_file()}
+
+    def _save_image_cache(self, images_dir: Path) -> None:
+        """Persist the src -> filename map so re-runs skip unchanged images."""
+        with open(images_dir / _IMAGE_CACHE_FILE, 'wb') as f:
+            f.write(_json_dumps(self._image_cache))
+
+    def clean_confluence_html(self, tree: lxml_html.HtmlElement) -> lxml_html.HtmlElement:
+        """Clean Confluence-specific HTML elements."""
+        # Remove Confluence-specific elements and convert layout sections and
+        # cells to plain <div>s; lxml filters the walk down to those tags
+        for element in list(tree.iter(*_CONFLUENCE_STRIP_TAGS, *_CONFLUENCE_LAYOUT_CLASSES)):
+            name = element.tag
+            if name in _CONFLUENCE_STRIP_TAGS:
+                element.drop_tree()
+            elif name in _CONFLUENCE_LAYOUT_CLASSES:
+                element.tag = 'div'
+                element.set('class', _CONFLUENCE_LAYOUT_CLASSES[name])
         
-        return str(soup)
-
-    def convert_to_markdown(self, html_content: str) -> str:
-        """Convert HTML content to Markdown."""
-        # Configure markdownify options
-        markdown_content = markdownify(
-            html_content,
-            heading_style="ATX",  # Use # for headings
-            bullets="-",  # Use - for bullets
-            strip=['script', 'style'],  # Remove scripts and styles
-            convert=['div', 'span', 'section'],  # Convert these tags
-        )
+        return tree
+
+    def convert_to_markdown(self, tree: lxml_html.HtmlElement) -> str:
+        """Convert the parsed HTML tree to Markdown."""
+        markdown_content = _tree_to_markdown(tree)
+        if markdown_content is None:
+            # Fall back to markdownify for markup outside the common subset
+            markdown_content = markdownify(
+                lxml_html.tostring(tree, encoding='unicode'),
+                heading_style="ATX",  # Use # for headings
+                bullets="-",  # Use - for bullets
+                strip=['script', 'style'],  # Remove scripts and styles
+            )
         
         # Clean up the markdown
-        markdown_content = re.sub(r'\n\s*\n\s*\n', '\n\n', markdown_content)  # Remove excessive newlines
+        markdown_content = _MULTI_NEWLINE.sub('\n\n', markdown_content)  # Remove excessive newlines
         markdown_content = markdown_content.strip()
         
         return markdown_content
@@ -237,13 +380,12 @@ class ConfluenceToMarkdown:
     def create_output_structure(self, output_dir: str) -> Tuple[Path, Path, Path]:
         """Create the output directory structure."""
         base_dir = Path(output_dir)
-        base_dir.mkdir(exist_ok=True)
-        
         images_dir = base_dir / "images"
         attachments_dir = base_dir / "attachments"
         
-        images_dir.mkdir(exist_ok=True)
-        attachments_dir.mkdir(exist_ok=True)
+        # makedirs creates base_dir along with the first leaf directory
+        os.makedirs(images_dir, exist_ok=True)
+        os.makedirs(attachments_dir, exist_ok=True)
         
         return base_dir, images_dir, attachments_dir
 
@@ -257,25 +399,46 @@ class ConfluenceToMarkdown:
             # Create output structure
             base_dir, images_dir, attachments_dir = self.create_output_structure(output_dir)
             
-            # Get page content
-            page_data = self.get_page_content(page_id)
-            
-            page_title = page_data['title']
-            html_content = page_data['body']['storage']['value']
-            
-            print(f"Converting page: {page_title}")
-            
-            # Process images in HTML content
-            html_content = self.process_images_in_html(html_content, images_dir)
-            
-            # Clean Confluence-specific HTML
-            html_content = self.clean_confluence_html(html_content)
-            
-            # Convert to Markdown
-            markdown_content = self.convert_to_markdown(html_content)
+            # Look up the page version once; cached page content is keyed by it
+            version = self.get_page_version(page_id)
             
-            # Add metadata header
-            metadata = f"""# {page_title}
+            with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS) as executor:
+                # Fetch the attachment list while the page content is retrieved
+                attachments_future = executor.submit(self.get_page_attachments, page_id)
+                
+                # Get page content
+                page_data = self.get_page_content(page_id, version)
+                
+                page_title = page_data['title']
+                html_content = page_data['body']['storage']['value']
+                
+                print(f"Converting page: {page_title}")
+                
+                # Download attachments in the background while the page is converted
+                attachments = attachments_future.result()
+                if attachments:
+                    print(f"Found {len(attachments)} attachments")
+                submit = executor.submit
+                download_attachment = self.download_attachment
+                attachment_futures = [
+                    submit(download_attachment, attachment, attachments_dir)
+                    for attachment in attachments
+                ]
+                
+                # Parse the page once and run every HTML pass on the same tree
+                tree = _parse_html(html_content)
+                
+                # Process images in HTML content
+                tree, images_count = self.process_images_in_html(tree, images_dir)
+                
+                # Clean Confluence-specific HTML
+                tree = self.clean_confluence_html(tree)
+                
+                # Convert to Markdown
+                markdown_content = self.convert_to_markdown(tree)
+                
+                # Add metadata header
+                metadata = f"""# {page_title}
 
 **Space:** {space_key}  
 **Page ID:** {page_id}  
@@ -285,23 +448,21 @@ class ConfluenceToMarkdown:
 ---
 
 """
-            markdown_content = metadata + markdown_content
-            
-            # Save markdown file
-            md_filename = re.sub(r'[^\w\s-]', '', page_title).strip() + '.md'
-            md_filepath = base_dir / md_filename
-            
-            with open(md_filepath, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            print(f"Saved markdown: {md_filepath}")
-            
-            # Download attachments
-            attachments = self.get_page_attachments(page_id)
-            if attachments:
-                print(f"Found {len(attachments)} attachments")
-                for attachment in attachments:
-                    self.download_attachment(attachment, attachments_dir)
+                markdown_content = metadata + markdown_content
+                
+                # Save markdown file
+                md_filename = _TITLE_SANITIZE.sub('', page_title).strip() + '.md'
+                md_filepath = base_dir / md_filename
+                
+                # Encode once and write the bytes in a single call
+                with open(md_filepath, 'wb') as f:
+                    f.write(markdown_content.encode('utf-8'))
+                
+                print(f"Saved markdown: {md_filepath}")
+                
+                # Wait for the attachments, surfacing any download error
+                for future in attachment_futures:
+                    future.result()
             
             # Create a summary file
             summary = {
@@ -310,13 +471,13 @@ class ConfluenceToMarkdown:
                 'page_id': page_id,
                 'page_url': page_url,
                 'markdown_file': md_filename,
-                'images_count': len(list(images_dir.glob('*'))) if images_dir.exists() else 0,
+                'images_count': images_count,
                 'attachments_count': len(attachments),
                 'converted_at': page_data['version']['when']
             }
             
-            with open(base_dir / 'conversion_summary.json', 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2)
+            with open(base_dir / 'conversion_summary.json', 'wb') as f:
+                f.write(_json_dumps(summary))
             
             print(f"\nConversion completed successfully!")
             print(f"Output directory: {base_dir}")
@@ -329,6 +490,175 @@ class ConfluenceToMarkdown:
             sys.exit(1)
 
 
+def _parse_html(html_content: str) -> lxml_html.HtmlElement:
+    """Parse page HTML into a full document tree (empty pages included)."""
+    if not html_content.strip():
+        html_content = '<html><body></body></html>'
+    return lxml_html.document_fromstring(html_content)
+
+
+def _tree_to_markdown(tree: lxml_html.HtmlElement) -> Optional[str]:
+    """Render a page made of common tags to Markdown, or return None for other markup."""
+    for element in tree.iter():
+        if isinstance(element.tag, str) and element.tag not in _MD_TAGS:
+            return None
+    parts: List[str] = []
+    _to_md(tree, parts)
+    return ''.join(parts)
+
+
+def _to_md(element: lxml_html.HtmlElement, parts: List[str]) -> None:
+    """Append the Markdown for an element (without its tail) to parts."""
+    tag = element.tag
+    if not isinstance(tag, str):
+        # Comments and processing instructions
+        return
+    
+    if tag in _MD_HEADINGS:
+        text = _MD_WHITESPACE.sub(' ', _md_inline(element)).strip()
+        parts.append(f"\n\n{_MD_HEADINGS[tag]} {text}\n\n")
+    elif tag in _MD_BLOCK_TAGS:
+        text = _md_inline(element).strip()
+        if text:
+            parts.append(f"\n\n{text}\n\n")
+    elif tag == 'ul' or tag == 'ol':
+        parts.append(_md_list(element))
+    elif tag == 'li':
+        parts.append(f"- {_md_inline(element).strip()}\n")
+    elif tag == 'strong' or tag == 'b':
+        parts.append(_md_wrap(_md_inline(element), '**', '**'))
+    elif tag == 'em' or tag == 'i':
+        parts.append(_md_wrap(_md_inline(element), '*', '*'))
+    elif tag == 'code':
+        text = _MD_WHITESPACE.sub(' ', element.text_content())
+        parts.append(_md_wrap(text, '`', '`'))
+    elif tag == 'pre':
+        code = element.text_content().rstrip('\n')
+        parts.append(f"\n\n```\n{code}\n```\n\n")
+    elif tag == 'a':
+        parts.append(_md_link(element))
+    elif tag == 'img':
+        title = element.get('title')
+        title_part = f' "{title}"' if title else ''
+        parts.append(f"![{element.get('alt') or ''}]({element.get('src') or ''}{title_part})")
+    elif tag == 'br':
+        parts.append('  \n')
+    elif tag == 'hr':
+        parts.append('\n\n---\n\n')
+    elif tag == 'table':
+        parts.append(_md_table(element))
+    else:
+        _md_children(element, parts)
+
+
+def _md_children(element: lxml_html.HtmlElement, parts: List[str]) -> None:
+    """Append the Markdown for an element's text and children to parts."""
+    if element.text:
+        parts.append(_md_text(element.text))
+    for child in element:
+        _to_md(child, parts)
+        if child.tail:
+            parts.append(_md_text(child.tail))
+
+
+def _md_inline(element: lxml_html.HtmlElement) -> str:
+    """Return the Markdown for an element's content."""
+    parts: List[str] = []
+    _md_children(element, parts)
+    return ''.join(parts)
+
+
+def _md_text(text: str) -> str:
+    """Collapse whitespace and escape Markdown characters in a text node."""
+    return _MD_ESCAPE.sub(r'\\\1', _MD_WHITESPACE.sub(' ', text))
+
+
+def _md_wrap(text: str, start: str, end: str) -> str:
+    """Wrap inline text in markers, keeping surrounding spaces outside them."""
+    stripped = text.strip()
+    if not stripped:
+        return ''
+    prefix = ' ' if text[0] == ' ' else ''
+    suffix = ' ' if text[-1] == ' ' else ''
+    return f"{prefix}{start}{stripped}{end}{suffix}"
+
+
+def _md_link(element: lxml_html.HtmlElement) -> str:
+    """Return the Markdown for an <a> element."""
+    text = _md_inline(element)
+    href = element.get('href')
+    title = element.get('title')
+    if not href or not text.strip():
+        return text
+    if text.strip() == href and not title:
+        return f"<{href}>"
+    title_part = f' "{title}"' if title else ''
+    return _md_wrap(text, '[', f"]({href}{title_part})")
+
+
+def _md_list(element: lxml_html.HtmlElement) -> str:
+    """Return the Markdown for a <ul> or <ol> element, indenting nested lists."""
+    items = []
+    for child in element:
+        if child.tag != 'li':
+            continue
+        bullet = f"{len(items) + 1}." if element.tag == 'ol' else '-'
+        text = _md_inline(child).strip().replace('\n', '\n' + ' ' * (len(bullet) + 1))
+        items.append(f"{bullet} {text}\n")
+    parent = element.getparent()
+    separator = '\n' if parent is not None and parent.tag == 'li' else '\n\n'
+    return separator + ''.join(items) + separator
+
+
+def _md_table(element: lxml_html.HtmlElement) -> str:
+    """Return the Markdown for a <table> element."""
+    rows = []
+    for row in element.iter('tr'):
+        cells = [
+            _MD_WHITESPACE.sub(' ', _md_inline(cell)).strip()
+            for cell in row if cell.tag == 'th' or cell.tag == 'td'
+        ]
+        rows.append(cells)
+    if not rows:
+        return ''
+    
+    # Markdown tables need a header row; leave it blank when the table has none
+    first_row = element.find('.//tr')
+    if all(cell.tag == 'th' for cell in first_row if isinstance(cell.tag, str)):
+        header, body = rows[0], rows[1:]
+    else:
+        header, body = [''] * len(rows[0]), rows
+    
+    lines = ['| ' + ' | '.join(header) + ' |', '| ' + ' | '.join(['---'] * len(header)) + ' |']
+    lines.extend('| ' + ' | '.join(cells) + ' |' for cells in body)
+    return '\n\n' + '\n'.join(lines) + '\n\n'
+
+
+def _src_digest(src: str) -> str:
+    """Short hash of an image src, used to give each image its own file name."""
+    return hashlib.blake2b(src.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def _json_loads(data: bytes):
+    """Decode JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode JSON as indented UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _log(message: str) -> None:
+    """Print a progress message without interleaving output from other threads."""
+    with _print_lock:
+        print(message)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Convert Confluence page to Markdown')
     parser.add_argument('--url', required=True, help='Confluence page URL')
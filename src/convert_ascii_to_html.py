@@ -5,208 +5,416 @@ Converts ASCII art diagrams from text or markdown files to academic-style HTML p
 
 Usage:
     python convert_ascii_to_html.py <input_folder> <output_folder>
+
+Optional:
+    google-re2 (linear-time title matching; install with: pip install google-re2)
 """
 
+import functools
 import os
 import sys
 import re
+from itertools import repeat
 from pathlib import Path
 
+try:
+    import re2 as _title_re_engine
+except ImportError:
+    _title_re_engine = re
+
+# Below this many files the conversion runs serially instead of in worker processes
+_PARALLEL_MIN_FILES = 8
+
+# Threads used to overlap file reads and writes in small batches
+_IO_WORKERS = 4
+
+# Title lines: "FIGURE N: ..." captions and ALL-CAPS headings longer than 10 characters
+_TITLE_RE = _title_re_engine.compile(
+    r'(?m)^[^\S\n]*(?:(?P<figure>(?i:FIGURE)[^\S\n]+\d+:.*)|(?P<allcaps>[A-Z](?:[A-Z]|[^\S\n]){9,}[A-Z]))[^\S\n]*$'
+)
+
+# Title used when no FIGURE caption or ALL-CAPS heading is found
+_DEFAULT_TITLE = "ASCII Diagram"
+
+# Box-drawing characters; a line containing any of them is diagram, not caption
+_BOX_RE = re.compile(r'[┌┐└┘│─┬┴├┤┼]')
+
+# Flags for creating output files; O_BINARY stops newline translation on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Characters escaped in diagram text placed inside HTML
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# Markdown code fence markers around the ASCII art
+_FENCE_OPEN_RE = re.compile(r'^```[\w]*\n', re.MULTILINE)
+_FENCE_CLOSE_RE = re.compile(r'\n```$', re.MULTILINE)
+
+# Blank lines before the first and after the last line with content
+_EDGE_BLANK_LINES_RE = re.compile(r'\A\s*\n|\n\s*\Z')
+
 
 def extract_title_from_content(content):
     """Extract title from ASCII art content."""
-    lines = content.strip().split('\n')
+    # The title depends only on the first 11 lines, so duplicate files share a cache entry
+    return _extract_title_cached('\n'.join(content.lstrip().split('\n', 11)[:11]))
+
+
+@functools.lru_cache(maxsize=512)
+def _extract_title_cached(head_lines):
+    """Extract title from the first 11 lines of ASCII art content."""
+    # The first 10 lines are searched; the 11th can still describe a figure on the 10th
+    lines = head_lines.strip().split('\n', 11)
+    head = '\n'.join(lines[:10])
     
     # Look for patterns like "FIGURE X:" or titles in first few lines
-    for i, line in enumerate(lines[:10]):
-        line = line.strip()
-        if re.match(r'^FIGURE\s+\d+:', line, re.IGNORECASE):
-            title = line
-            # Check if next line has description
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                if next_line and not any(char in next_line for char in '┌┐└┘│─┬┴├┤┼'):
-                    title += f" - {next_line}"
-            return title
-        elif re.match(r'^[A-Z][A-Z\s]+[A-Z]$', line) and len(line) > 10:
-            return line
+    match = _TITLE_RE.search(head)
+    if match is None:
+        return _DEFAULT_TITLE
+    if match.group('allcaps'):
+        return match.group('allcaps')
     
-    return "ASCII Diagram"
+    title = match.group('figure').strip()
+    # Check if next line has description
+    i = head.count('\n', 0, match.start())
+    if i + 1 < len(lines):
+        next_line = lines[i + 1].strip()
+        if next_line and not _BOX_RE.search(next_line):
+            title += f" - {next_line}"
+    return title
 
 
 def clean_ascii_content(content):
     """Clean and prepare ASCII content for HTML display."""
     # Remove any markdown code block markers
-    content = re.sub(r'^```[\w]*\n', '', content, flags=re.MULTILINE)
-    content = re.sub(r'\n```$', '', content, flags=re.MULTILINE)
+    if '```' in content:
+        content = _FENCE_OPEN_RE.sub('', content)
+        content = _FENCE_CLOSE_RE.sub('', content)
     
-    # Ensure proper line endings
-    lines = content.split('\n')
+    # Nothing to trim when the text starts and ends with visible characters
+    if content and not content[0].isspace() and not content[-1].isspace():
+        return content
     
-    # Remove excessive empty lines at start and end
-    while lines and not lines[0].strip():
-        lines.pop(0)
-    while lines and not lines[-1].strip():
-        lines.pop()
+    if not content or content.isspace():
+        return ''
     
-    return '\n'.join(lines)
+    # Remove excessive empty lines at start and end
+    return _EDGE_BLANK_LINES_RE.sub('', content)
 
 
-def create_html_from_ascii(ascii_content, title, filename):
-    """Create HTML content from ASCII art."""
-    
-    # Clean the ASCII content
-    clean_content = clean_ascii_content(ascii_content)
-    
-    html_template = f"""<!DOCTYPE html>
+# Stylesheets shared by every diagram page and by the index page
+_DIAGRAM_CSS = """/* Academic paper styling */
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: 'Times New Roman', Times, serif;
+    line-height: 1.6;
+    color: #000;
+    background: #fff;
+    padding: 40px 20px;
+    max-width: 1200px;
+    margin: 0 auto;
+}
+
+.paper-container {
+    background: white;
+    box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
+    border: 1px solid #ddd;
+    margin: 0 auto;
+    padding: 60px;
+    min-height: calc(100vh - 80px);
+}
+
+.header {
+    text-align: center;
+    margin-bottom: 40px;
+    border-bottom: 2px solid #333;
+    padding-bottom: 20px;
+}
+
+.header h1 {
+    font-size: 1.8em;
+    font-weight: bold;
+    margin-bottom: 10px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.header .subtitle {
+    font-size: 1.1em;
+    font-style: italic;
+    color: #555;
+    margin-bottom: 10px;
+}
+
+.header .meta {
+    font-size: 0.9em;
+    color: #666;
+    margin-top: 15px;
+}
+
+.figure-container {
+    margin: 40px 0;
+    page-break-inside: avoid;
+}
+
+.figure-title {
+    font-weight: bold;
+    font-size: 1.1em;
+    text-align: center;
+    margin-bottom: 20px;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}
+
+.ascii-diagram {
+    font-family: 'Courier New', 'Lucida Console', monospace;
+    font-size: 12px;
+    line-height: 1.2;
+    background: #fafafa;
+    border: 1px solid #ccc;
+    border-radius: 4px;
+    padding: 30px;
+    margin: 20px 0;
+    overflow-x: auto;
+    white-space: pre;
+    color: #000;
+    text-align: left;
+}
+
+.figure-caption {
+    font-size: 0.95em;
+    text-align: center;
+    margin-top: 15px;
+    font-style: italic;
+    color: #555;
+    padding: 0 40px;
+}
+
+.navigation {
+    margin-top: 40px;
+    padding-top: 20px;
+    border-top: 1px solid #ddd;
+    text-align: center;
+}
+
+.nav-link {
+    display: inline-block;
+    margin: 0 10px;
+    padding: 8px 16px;
+    background: #f8f9fa;
+    border: 1px solid #dee2e6;
+    border-radius: 4px;
+    text-decoration: none;
+    color: #495057;
+    font-size: 0.9em;
+}
+
+.nav-link:hover {
+    background: #e9ecef;
+    text-decoration: none;
+}
+
+/* Print styles */
+@media print {
+    body {
+        font-size: 11pt;
+        padding: 0;
+    }
+
+    .paper-container {
+        box-shadow: none;
+        border: none;
+        padding: 40px;
+    }
+
+    .navigation {
+        display: none;
+    }
+}
+
+/* High contrast for better readability */
+@media (prefers-contrast: high) {
+    .ascii-diagram {
+        background: #fff;
+        border: 2px solid #000;
+    }
+}
+"""
+
+_INDEX_CSS = """/* Academic index styling */
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: 'Times New Roman', Times, serif;
+    line-height: 1.6;
+    color: #000;
+    background: #f5f5f5;
+    padding: 40px 20px;
+}
+
+.container {
+    max-width: 1000px;
+    margin: 0 auto;
+    background: white;
+    box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
+    border-radius: 8px;
+    overflow: hidden;
+}
+
+.header {
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: white;
+    padding: 40px;
+    text-align: center;
+}
+
+.header h1 {
+    font-size: 2.5em;
+    margin-bottom: 10px;
+    font-weight: normal;
+}
+
+.header .subtitle {
+    font-size: 1.2em;
+    opacity: 0.9;
+    font-style: italic;
+}
+
+.content {
+    padding: 40px;
+}
+
+.description {
+    font-size: 1.1em;
+    margin-bottom: 40px;
+    text-align: center;
+    color: #555;
+    line-height: 1.8;
+}
+
+.diagrams-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
+    gap: 30px;
+    margin-top: 30px;
+}
+
+.diagram-card {
+    border: 1px solid #ddd;
+    border-radius: 8px;
+    overflow: hidden;
+    transition: transform 0.2s ease, box-shadow 0.2s ease;
+}
+
+.diagram-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.1);
+}
+
+.diagram-card a {
+    text-decoration: none;
+    color: inherit;
+    display: block;
+}
+
+.card-header {
+    background: #f8f9fa;
+    padding: 20px;
+    border-bottom: 1px solid #dee2e6;
+}
+
+.card-title {
+    font-size: 1.1em;
+    font-weight: bold;
+    margin-bottom: 5px;
+    color: #2c3e50;
+}
+
+.card-meta {
+    font-size: 0.9em;
+    color: #6c757d;
+}
+
+.card-preview {
+    padding: 15px;
+    background: #fafafa;
+    font-family: 'Courier New', monospace;
+    font-size: 0.7em;
+    line-height: 1.1;
+    max-height: 120px;
+    overflow: hidden;
+    white-space: pre;
+    position: relative;
+}
+
+.card-preview::after {
+    content: '';
+    position: absolute;
+    bottom: 0;
+    left: 0;
+    right: 0;
+    height: 30px;
+    background: linear-gradient(transparent, #fafafa);
+}
+
+.stats {
+    margin-top: 40px;
+    padding: 20px;
+    background: #f8f9fa;
+    border-radius: 8px;
+    text-align: center;
+}
+
+.stats h3 {
+    margin-bottom: 15px;
+    color: #2c3e50;
+}
+
+.stat-item {
+    display: inline-block;
+    margin: 0 20px;
+    padding: 10px;
+}
+
+.stat-number {
+    font-size: 2em;
+    font-weight: bold;
+    color: #3498db;
+    display: block;
+}
+
+.stat-label {
+    font-size: 0.9em;
+    color: #7f8c8d;
+}
+
+@media (max-width: 768px) {
+    .diagrams-grid {
+        grid-template-columns: 1fr;
+    }
+
+    .header h1 {
+        font-size: 2em;
+    }
+}
+"""
+
+# Page shell for one diagram, filled in with str.format
+_HTML_SHELL = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
-    <style>
-        /* Academic paper styling */
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            line-height: 1.6;
-            color: #000;
-            background: #fff;
-            padding: 40px 20px;
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        
-        .paper-container {{
-            background: white;
-            box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
-            border: 1px solid #ddd;
-            margin: 0 auto;
-            padding: 60px;
-            min-height: calc(100vh - 80px);
-        }}
-        
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            border-bottom: 2px solid #333;
-            padding-bottom: 20px;
-        }}
-        
-        .header h1 {{
-            font-size: 1.8em;
-            font-weight: bold;
-            margin-bottom: 10px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        
-        .header .subtitle {{
-            font-size: 1.1em;
-            font-style: italic;
-            color: #555;
-            margin-bottom: 10px;
-        }}
-        
-        .header .meta {{
-            font-size: 0.9em;
-            color: #666;
-            margin-top: 15px;
-        }}
-        
-        .figure-container {{
-            margin: 40px 0;
-            page-break-inside: avoid;
-        }}
-        
-        .figure-title {{
-            font-weight: bold;
-            font-size: 1.1em;
-            text-align: center;
-            margin-bottom: 20px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        
-        .ascii-diagram {{
-            font-family: 'Courier New', 'Lucida Console', monospace;
-            font-size: 12px;
-            line-height: 1.2;
-            background: #fafafa;
-            border: 1px solid #ccc;
-            border-radius: 4px;
-            padding: 30px;
-            margin: 20px 0;
-            overflow-x: auto;
-            white-space: pre;
-            color: #000;
-            text-align: left;
-        }}
-        
-        .figure-caption {{
-            font-size: 0.95em;
-            text-align: center;
-            margin-top: 15px;
-            font-style: italic;
-            color: #555;
-            padding: 0 40px;
-        }}
-        
-        .navigation {{
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            text-align: center;
-        }}
-        
-        .nav-link {{
-            display: inline-block;
-            margin: 0 10px;
-            padding: 8px 16px;
-            background: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 4px;
-            text-decoration: none;
-            color: #495057;
-            font-size: 0.9em;
-        }}
-        
-        .nav-link:hover {{
-            background: #e9ecef;
-            text-decoration: none;
-        }}
-        
-        /* Print styles */
-        @media print {{
-            body {{
-                font-size: 11pt;
-                padding: 0;
-            }}
-            
-            .paper-container {{
-                box-shadow: none;
-                border: none;
-                padding: 40px;
-            }}
-            
-            .navigation {{
-                display: none;
-            }}
-        }}
-        
-        /* High contrast for better readability */
-        @media (prefers-contrast: high) {{
-            .ascii-diagram {{
-                background: #fff;
-                border: 2px solid #000;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="styles.css">
 </head>
 <body>
     <div class="paper-container">
@@ -235,181 +443,27 @@ def create_html_from_ascii(ascii_content, title, filename):
     </div>
 </body>
 </html>"""
+
+
+def create_html_from_ascii(ascii_content, title, filename):
+    """Create HTML content from ASCII art."""
+    
+    # Clean the ASCII content and escape it for embedding in HTML
+    clean_content = clean_ascii_content(ascii_content).translate(_HTML_ESCAPE_TABLE)
+    
+    html_template = _HTML_SHELL.format(title=title, filename=filename, clean_content=clean_content)
     
     return html_template
 
 
-def create_index_html(diagrams_info, output_dir):
-    """Create an index HTML file for all diagrams."""
-    
-    index_template = f"""<!DOCTYPE html>
+# Index page up to the diagram cards
+_INDEX_PREFIX = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ASCII Diagrams Index - Academic Collection</title>
-    <style>
-        /* Academic index styling */
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            line-height: 1.6;
-            color: #000;
-            background: #f5f5f5;
-            padding: 40px 20px;
-        }}
-        
-        .container {{
-            max-width: 1000px;
-            margin: 0 auto;
-            background: white;
-            box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
-            border-radius: 8px;
-            overflow: hidden;
-        }}
-        
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            font-weight: normal;
-        }}
-        
-        .header .subtitle {{
-            font-size: 1.2em;
-            opacity: 0.9;
-            font-style: italic;
-        }}
-        
-        .content {{
-            padding: 40px;
-        }}
-        
-        .description {{
-            font-size: 1.1em;
-            margin-bottom: 40px;
-            text-align: center;
-            color: #555;
-            line-height: 1.8;
-        }}
-        
-        .diagrams-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-            margin-top: 30px;
-        }}
-        
-        .diagram-card {{
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            overflow: hidden;
-            transition: transform 0.2s ease, box-shadow 0.2s ease;
-        }}
-        
-        .diagram-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .diagram-card a {{
-            text-decoration: none;
-            color: inherit;
-            display: block;
-        }}
-        
-        .card-header {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        
-        .card-title {{
-            font-size: 1.1em;
-            font-weight: bold;
-            margin-bottom: 5px;
-            color: #2c3e50;
-        }}
-        
-        .card-meta {{
-            font-size: 0.9em;
-            color: #6c757d;
-        }}
-        
-        .card-preview {{
-            padding: 15px;
-            background: #fafafa;
-            font-family: 'Courier New', monospace;
-            font-size: 0.7em;
-            line-height: 1.1;
-            max-height: 120px;
-            overflow: hidden;
-            white-space: pre;
-            position: relative;
-        }}
-        
-        .card-preview::after {{
-            content: '';
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            height: 30px;
-            background: linear-gradient(transparent, #fafafa);
-        }}
-        
-        .stats {{
-            margin-top: 40px;
-            padding: 20px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            text-align: center;
-        }}
-        
-        .stats h3 {{
-            margin-bottom: 15px;
-            color: #2c3e50;
-        }}
-        
-        .stat-item {{
-            display: inline-block;
-            margin: 0 20px;
-            padding: 10px;
-        }}
-        
-        .stat-number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #3498db;
-            display: block;
-        }}
-        
-        .stat-label {{
-            font-size: 0.9em;
-            color: #7f8c8d;
-        }}
-        
-        @media (max-width: 768px) {{
-            .diagrams-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .header h1 {{
-                font-size: 2em;
-            }}
-        }}
-    </style>
+    <link rel="stylesheet" href="index.css">
 </head>
 <body>
     <div class="container">
@@ -427,29 +481,26 @@ def create_index_html(diagrams_info, output_dir):
             
             <div class="diagrams-grid">"""
 
-    # Add each diagram card
-    for info in diagrams_info:
-        preview_lines = info['content'].split('\n')[:8]  # First 8 lines for preview
-        preview = '\n'.join(preview_lines)
-        
-        index_template += f"""
+# One diagram card on the index page, filled in with str.format
+_CARD_TEMPLATE = """
                 <div class="diagram-card">
-                    <a href="{info['filename']}">
+                    <a href="{filename}">
                         <div class="card-header">
-                            <div class="card-title">{info['title']}</div>
-                            <div class="card-meta">Source: {info['source_file']}</div>
+                            <div class="card-title">{title}</div>
+                            <div class="card-meta">Source: {source_file}</div>
                         </div>
                         <div class="card-preview">{preview}</div>
                     </a>
                 </div>"""
 
-    index_template += f"""
+# Index page after the diagram cards, filled in with str.format
+_INDEX_SUFFIX = """
             </div>
             
             <div class="stats">
                 <h3>Collection Statistics</h3>
                 <div class="stat-item">
-                    <span class="stat-number">{len(diagrams_info)}</span>
+                    <span class="stat-number">{count}</span>
                     <span class="stat-label">Diagrams</span>
                 </div>
                 <div class="stat-item">
@@ -465,8 +516,82 @@ def create_index_html(diagrams_info, output_dir):
     </div>
 </body>
 </html>"""
+
+
+def create_index_html(diagrams_info, output_dir):
+    """Create an index HTML file for all diagrams."""
+    
+    parts = [_INDEX_PREFIX]
+
+    # Add each diagram card
+    for info in diagrams_info:
+        parts.append(_CARD_TEMPLATE.format(
+            filename=info['filename'],
+            title=info['title'],
+            source_file=info['source_file'],
+            preview=info['preview'].translate(_HTML_ESCAPE_TABLE),
+        ))
+
+    parts.append(_INDEX_SUFFIX.format(count=len(diagrams_info)))
     
-    return index_template
+    return ''.join(parts)
+
+
+def _write_file(path, text):
+    """Write text as UTF-8 straight to a file descriptor, without Python's I/O buffering layers."""
+    data = memoryview(text.encode('utf-8'))
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        # os.write may write less than asked for; keep going until everything is out
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _process_one(ascii_file, output_path):
+    """Convert one ASCII art file to HTML; return its index entry (None if skipped) and log lines."""
+    log = [f"📖 Processing: {ascii_file.name}"]
+    
+    try:
+        # Read the ASCII content, keeping text-mode newline handling for CRLF files
+        content = ascii_file.read_bytes().decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        if not content or content.isspace():
+            log.append(f"⚠️  Skipping empty file: {ascii_file.name}")
+            return None, log
+        
+        # Extract title
+        title = extract_title_from_content(content)
+        log.append(f"✨ Extracted title: {title}")
+        
+        # Create HTML filename
+        html_filename = ascii_file.stem + '.html'
+        html_path = output_path / html_filename
+        
+        # Generate HTML
+        html_content = create_html_from_ascii(content, title, ascii_file.name)
+        
+        # Write HTML file
+        _write_file(html_path, html_content)
+        
+        log.append(f"✅ Created: {html_filename}")
+        
+        # Info for the index
+        info = {
+            'title': title,
+            'filename': html_filename,
+            'source_file': ascii_file.name,
+            # First 8 lines (of the first 1000 chars) for preview; split stops after 8 newlines
+            'preview': '\n'.join(content[:1000].split('\n', 8)[:8])
+        }
+        return info, log
+        
+    except Exception as e:
+        log.append(f"❌ Error processing {ascii_file.name}: {str(e)}")
+        return None, log
 
 
 def convert_ascii_to_html(input_folder, output_folder):
@@ -482,15 +607,22 @@ def convert_ascii_to_html(input_folder, output_folder):
     # Create output directory
     output_path.mkdir(parents=True, exist_ok=True)
     
+    # Write the stylesheets once; every page links to them
+    _write_file(output_path / 'styles.css', _DIAGRAM_CSS)
+    _write_file(output_path / 'index.css', _INDEX_CSS)
+    
     print("📚 ASCII Art to HTML Converter - Academic Style")
     print(f"📂 Input:  {input_folder}")
     print(f"📂 Output: {output_folder}")
     print()
     
-    # Find all text and markdown files
-    ascii_files = []
-    for pattern in ['*.txt', '*.md']:
-        ascii_files.extend(input_path.glob(pattern))
+    # Find all text and markdown files in a single directory scan
+    with os.scandir(input_path) as entries:
+        ascii_files = sorted(
+            (Path(entry.path) for entry in entries
+             if entry.name.endswith(('.txt', '.md')) and entry.is_file()),
+            key=lambda path: path.name,
+        )
     
     if not ascii_files:
         print("❌ No ASCII art files found (.txt or .md)")
@@ -498,50 +630,27 @@ def convert_ascii_to_html(input_folder, output_folder):
     
     print(f"🔍 Found {len(ascii_files)} ASCII art files")
     
+    # Large batches spread the work over worker processes; a handful of files is not
+    # worth starting them for, so threads just overlap one file's I/O with another's work
+    if len(ascii_files) >= _PARALLEL_MIN_FILES:
+        # Imported here: multiprocessing is slow to import and library callers never need it
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor()
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=_IO_WORKERS)
+    
     diagrams_info = []
-    converted_count = 0
+    with executor:
+        results = executor.map(_process_one, ascii_files, repeat(output_path), chunksize=4)
+        
+        # Print each file's messages in one write, in file order
+        for info, log in results:
+            sys.stdout.write('\n'.join(log) + '\n')
+            if info is not None:
+                diagrams_info.append(info)
     
-    for ascii_file in sorted(ascii_files):
-        print(f"📖 Processing: {ascii_file.name}")
-        
-        try:
-            # Read the ASCII content
-            with open(ascii_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if not content.strip():
-                print(f"⚠️  Skipping empty file: {ascii_file.name}")
-                continue
-            
-            # Extract title
-            title = extract_title_from_content(content)
-            print(f"✨ Extracted title: {title}")
-            
-            # Create HTML filename
-            html_filename = ascii_file.stem + '.html'
-            html_path = output_path / html_filename
-            
-            # Generate HTML
-            html_content = create_html_from_ascii(content, title, ascii_file.name)
-            
-            # Write HTML file
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"✅ Created: {html_filename}")
-            
-            # Store info for index
-            diagrams_info.append({
-                'title': title,
-                'filename': html_filename,
-                'source_file': ascii_file.name,
-                'content': content[:1000]  # First 1000 chars for preview
-            })
-            
-            converted_count += 1
-            
-        except Exception as e:
-            print(f"❌ Error processing {ascii_file.name}: {str(e)}")
+    converted_count = len(diagrams_info)
     
     # Create index.html
     if diagrams_info:
@@ -549,8 +658,7 @@ def convert_ascii_to_html(input_folder, output_folder):
         index_content = create_index_html(diagrams_info, output_folder)
         index_path = output_path / 'index.html'
         
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(index_content)
+        _write_file(index_path, index_content)
         
         print("✅ Created: index.html")
     
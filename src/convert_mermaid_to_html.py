@@ -23,169 +23,257 @@ Features:
     - Supports all Mermaid diagram types (flowchart, sequence, etc.)
 """
 
+import hashlib
+import json
+import mmap
 import os
 import re
 import sys
-import argparse
 from pathlib import Path
-from datetime import datetime
+
+# Below this many files the conversion uses threads instead of worker processes
+_PARALLEL_MIN_FILES = 8
+
+# Threads used to overlap file reads and writes in small batches
+_IO_WORKERS = 4
+
+# Mermaid code blocks, with either LF or CRLF line endings
+_MERMAID_RE = re.compile(r'(?s)```mermaid\r?\n(.*?)\r?\n```')
+
+# First level-1 heading
+_TITLE_RE = re.compile(r'^# (.*)', re.MULTILINE)
+
+# Records source file hashes in the output folder so re-runs skip unchanged files
+_CACHE_FILE = '.cache.json'
+
+# Bytes read at a time when hashing a file, so whole files are never held in memory
+_HASH_CHUNK_SIZE = 1 << 16
+
+# Format of the "Generated on" time shown on every page
+_TIMESTAMP_FORMAT = "%B %d, %Y at %I:%M %p"
+
+# Plural suffix for a count, indexed by count == 1
+_PLURAL = ('s', '')
+
+# Byte delimiters for scanning memory-mapped files with find() instead of a regex
+_MERMAID_FENCE_BYTES = b'```mermaid'
+_FENCE_CLOSE_BYTES = b'\n```'
+_HEADING_BYTES = b'\n# '
 
 def extract_mermaid_from_markdown(markdown_content):
     """Extract mermaid diagram content from markdown"""
-    patterns = [
-        r'```mermaid\n(.*?)\n```',  # Standard mermaid code block
-        r'```mermaid\r?\n(.*?)\r?\n```'  # Handle different line endings
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, markdown_content, re.DOTALL)
-        if matches:
-            return matches
-    
-    return []
+    return _MERMAID_RE.findall(markdown_content)
 
 def extract_title_from_markdown(markdown_content):
     """Extract title from markdown file"""
-    lines = markdown_content.split('\n')
-    for line in lines:
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "Mermaid Diagram"
+    match = _TITLE_RE.search(markdown_content)
+    return match.group(1).strip() if match else "Mermaid Diagram"
 
-def create_html_template(title, mermaid_diagrams, source_file):
-    """Create HTML template with Mermaid.js integration"""
-    
-    # Generate diagram sections
-    diagram_sections = []
-    for i, diagram in enumerate(mermaid_diagrams):
-        diagram_id = f"diagram-{i+1}"
-        diagram_sections.append(f'''
-        <div class="diagram-container">
-            <h2>Diagram {i+1}</h2>
-            <div class="mermaid-wrapper">
-                <div class="mermaid" id="{diagram_id}">
-{diagram.strip()}
-                </div>
-            </div>
-        </div>
-        ''')
+def _next_heading(data, pos):
+    """Return the start of the first '# ' line beginning at or after pos, or -1"""
+    if pos == 0 and data[:2] == b'# ':
+        return 0
+    i = data.find(_HEADING_BYTES, pos - 1 if pos else 0)
+    return i + 1 if i >= 0 else -1
+
+def _heading_line(data, start):
+    """Return the text of the heading line at start and the position where the line ends"""
+    line_end = data.find(b'\n', start)
+    if line_end < 0:
+        line_end = len(data)
+    return data[start + 2:line_end], line_end
+
+def _next_mermaid_block(data, pos):
+    """Return (start, body_start, body_end, end) of the first mermaid block at or after pos, or None"""
+    find = data.find
+    start = find(_MERMAID_FENCE_BYTES, pos)
+    while start >= 0:
+        # The fence line must end right after the language tag
+        body_start = start + len(_MERMAID_FENCE_BYTES)
+        if data[body_start:body_start + 1] == b'\r':
+            body_start += 1
+        if data[body_start:body_start + 1] == b'\n':
+            body_start += 1
+            close = find(_FENCE_CLOSE_BYTES, body_start)
+            if close < 0:
+                # No closing fence follows, so no later block can close either
+                return None
+            body_end = close
+            if close > body_start and data[close - 1:close] == b'\r':
+                body_end -= 1
+            return start, body_start, body_end, close + len(_FENCE_CLOSE_BYTES)
+        start = find(_MERMAID_FENCE_BYTES, start + 1)
+    return None
+
+def _iter_markdown_bytes(data):
+    """Yield (heading, diagram) byte pairs, one of them None, in document order
     
-    diagram_content = '\n'.join(diagram_sections)
+    Scans with find() rather than a regex: the first '# ' line is the title, and
+    headings inside a block, and blocks opened on a heading line, are skipped.
+    """
+    pos = 0
+    heading = _next_heading(data, 0)
+    block = _next_mermaid_block(data, 0)
+    while heading >= 0 or block is not None:
+        if block is None or 0 <= heading < block[0]:
+            text, pos = _heading_line(data, heading)
+            yield text, None
+        else:
+            start, body_start, body_end, pos = block
+            yield None, data[body_start:body_end]
+        
+        if heading < pos:
+            heading = _next_heading(data, pos)
+        if block is not None and block[0] < pos:
+            block = _next_mermaid_block(data, pos)
+
+def read_title_and_mermaid(md_file):
+    """Extract the title and mermaid diagram content from a markdown file, decoding only the matches"""
+    with open(md_file, 'rb') as f:
+        # Empty files cannot be mapped and have nothing to find
+        if os.fstat(f.fileno()).st_size == 0:
+            return "Mermaid Diagram", []
+        
+        title = None
+        mermaid_diagrams = []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A file without the fence literal has no diagrams; only its first heading is needed
+            if mm.find(_MERMAID_FENCE_BYTES) < 0:
+                heading = _next_heading(mm, 0)
+                if heading < 0:
+                    return "Mermaid Diagram", []
+                return _heading_line(mm, heading)[0].decode('utf-8').strip(), []
+            
+            for heading, diagram in _iter_markdown_bytes(mm):
+                if diagram is not None:
+                    # Match the line endings a text-mode read would give
+                    diagram = diagram.decode('utf-8')
+                    if '\r' in diagram:
+                        diagram = diagram.replace('\r\n', '\n').replace('\r', '\n')
+                    mermaid_diagrams.append(diagram)
+                elif title is None:
+                    title = heading.decode('utf-8').strip()
     
-    html_template = f'''<!DOCTYPE html>
+    return title if title is not None else "Mermaid Diagram", mermaid_diagrams
+
+# Static parts of a diagram page; create_html_template joins them around
+# the title, source file, diagram count, diagrams and generation time
+_PAGE_HEAD = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>'''
+
+_PAGE_STYLE = '''</title>
     <script src="https://cdn.jsdelivr.net/npm/mermaid@10.6.1/dist/mermaid.min.js"></script>
     <style>
         /* Modern, professional styling */
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 16px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
             color: white;
             padding: 30px 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 300;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.1em;
             opacity: 0.9;
             margin-bottom: 5px;
-        }}
+        }
         
-        .header .source {{
+        .header .source {
             font-size: 0.9em;
             opacity: 0.7;
             font-style: italic;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .diagram-container {{
+        .diagram-container {
             margin-bottom: 50px;
             padding: 30px;
             background: #f8f9fa;
             border-radius: 12px;
             border: 1px solid #e9ecef;
-        }}
+        }
         
-        .diagram-container h2 {{
+        .diagram-container h2 {
             color: #2c3e50;
             margin-bottom: 20px;
             font-size: 1.5em;
             border-bottom: 2px solid #3498db;
             padding-bottom: 10px;
-        }}
+        }
         
-        .mermaid-wrapper {{
+        .mermaid-wrapper {
             background: white;
             border-radius: 8px;
             padding: 20px;
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05);
             overflow-x: auto;
-        }}
+        }
         
-        .mermaid {{
+        .mermaid {
             text-align: center;
             min-height: 200px;
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
+        }
         
         /* Mermaid diagram styling */
-        .mermaid svg {{
+        .mermaid svg {
             max-width: 100%;
             height: auto;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #f8f9fa;
             padding: 20px 40px;
             text-align: center;
             color: #6c757d;
             border-top: 1px solid #e9ecef;
-        }}
+        }
         
-        .navigation {{
+        .navigation {
             margin-bottom: 30px;
             text-align: center;
-        }}
+        }
         
-        .nav-button {{
+        .nav-button {
             display: inline-block;
             padding: 12px 24px;
             background: #3498db;
@@ -194,69 +282,75 @@ def create_html_template(title, mermaid_diagrams, source_file):
             border-radius: 6px;
             margin: 0 10px;
             transition: background-color 0.3s ease;
-        }}
+        }
         
-        .nav-button:hover {{
+        .nav-button:hover {
             background: #2980b9;
-        }}
+        }
         
-        .diagram-count {{
+        .diagram-count {
             background: #e74c3c;
             color: white;
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 0.9em;
             margin-left: 10px;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 margin: 10px;
                 border-radius: 8px;
-            }}
+            }
             
-            .header {{
+            .header {
                 padding: 20px;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 1.8em;
-            }}
+            }
             
-            .content {{
+            .content {
                 padding: 20px;
-            }}
+            }
             
-            .diagram-container {{
+            .diagram-container {
                 padding: 20px;
                 margin-bottom: 30px;
-            }}
-        }}
+            }
+        }
         
         /* Print styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 background: white;
-            }}
+            }
             
-            .container {{
+            .container {
                 box-shadow: none;
                 border: 1px solid #ddd;
-            }}
+            }
             
-            .nav-button {{
+            .nav-button {
                 display: none;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>{title}</h1>
+            <h1>'''
+
+_PAGE_SOURCE = '''</h1>
             <div class="subtitle">Interactive Mermaid Diagrams</div>
-            <div class="source">Source: {source_file}</div>
-            <span class="diagram-count">{len(mermaid_diagrams)} Diagram{'s' if len(mermaid_diagrams) != 1 else ''}</span>
+            <div class="source">Source: '''
+
+_PAGE_COUNT = '''</div>
+            <span class="diagram-count">'''
+
+_PAGE_CONTENT = '''</span>
         </div>
         
         <div class="content">
@@ -266,21 +360,25 @@ def create_html_template(title, mermaid_diagrams, source_file):
                 <a href="#" onclick="location.reload()" class="nav-button">🔄 Refresh</a>
             </div>
             
-            {diagram_content}
+            '''
+
+_PAGE_FOOTER = '''
         </div>
         
         <div class="footer">
-            <p>Generated on {datetime.now().strftime("%B %d, %Y at %I:%M %p")}</p>
+            <p>Generated on '''
+
+_PAGE_TAIL = '''</p>
             <p>Powered by <a href="https://mermaid.js.org/" target="_blank">Mermaid.js</a></p>
         </div>
     </div>
 
     <script>
         // Initialize Mermaid with custom configuration
-        mermaid.initialize({{
+        mermaid.initialize({
             startOnLoad: true,
             theme: 'default',
-            themeVariables: {{
+            themeVariables: {
                 primaryColor: '#3498db',
                 primaryTextColor: '#2c3e50',
                 primaryBorderColor: '#2980b9',
@@ -290,30 +388,30 @@ def create_html_template(title, mermaid_diagrams, source_file):
                 gridColor: '#95a5a6',
                 secondaryColor: '#e74c3c',
                 tertiaryColor: '#f39c12'
-            }},
-            flowchart: {{
+            },
+            flowchart: {
                 useMaxWidth: true,
                 htmlLabels: true,
                 curve: 'basis'
-            }},
-            sequence: {{
+            },
+            sequence: {
                 useMaxWidth: true,
                 diagramMarginX: 50,
                 diagramMarginY: 10
-            }},
-            gantt: {{
+            },
+            gantt: {
                 useMaxWidth: true,
                 gridLineStartPadding: 350,
                 fontSize: 12
-            }}
-        }});
+            }
+        });
         
         // Error handling for failed diagram renders
-        window.addEventListener('load', function() {{
-            setTimeout(function() {{
+        window.addEventListener('load', function() {
+            setTimeout(function() {
                 const diagrams = document.querySelectorAll('.mermaid');
-                diagrams.forEach(function(diagram, index) {{
-                    if (diagram.innerHTML.trim() && !diagram.querySelector('svg')) {{
+                diagrams.forEach(function(diagram, index) {
+                    if (diagram.innerHTML.trim() && !diagram.querySelector('svg')) {
                         diagram.innerHTML = '<div style="padding: 20px; text-align: center; color: #e74c3c; border: 2px dashed #e74c3c; border-radius: 8px;">' +
                                           '<h3>⚠️ Diagram Render Error</h3>' +
                                           '<p>Unable to render this Mermaid diagram. Please check the syntax.</p>' +
@@ -322,43 +420,67 @@ def create_html_template(title, mermaid_diagrams, source_file):
                                           '<pre style="background: #f8f9fa; padding: 10px; margin-top: 10px; border-radius: 4px; font-size: 12px;">' + 
                                           diagram.getAttribute('data-original') + '</pre>' +
                                           '</details></div>';
-                    }}
-                }});
-            }}, 2000);
-        }});
+                    }
+                });
+            }, 2000);
+        });
     </script>
 </body>
 </html>'''
-    
-    return html_template
 
-def create_index_html(output_folder, converted_files):
-    """Create an index page listing all converted diagrams"""
-    
-    file_links = []
-    for file_info in converted_files:
-        filename = file_info['filename']
-        title = file_info['title']
-        diagram_count = file_info['diagram_count']
-        source = file_info['source']
-        
-        file_links.append(f'''
-        <div class="diagram-card">
-            <h3><a href="{filename}">{title}</a></h3>
-            <div class="diagram-info">
-                <span class="diagram-count">{diagram_count} diagram{'s' if diagram_count != 1 else ''}</span>
-                <span class="source-file">Source: {source}</span>
-            </div>
-            <p class="diagram-description">Interactive Mermaid diagram visualization</p>
-            <div class="card-actions">
-                <a href="{filename}" class="view-button">View Diagrams</a>
+# Pages are written in binary mode, so the static parts are encoded once here
+_PAGE_HEAD, _PAGE_STYLE, _PAGE_SOURCE, _PAGE_COUNT, _PAGE_CONTENT, _PAGE_FOOTER, _PAGE_TAIL = (
+    part.encode('utf-8') for part in (
+        _PAGE_HEAD, _PAGE_STYLE, _PAGE_SOURCE, _PAGE_COUNT, _PAGE_CONTENT, _PAGE_FOOTER, _PAGE_TAIL,
+    )
+)
+
+# One diagram section of a page, filled in with str.format
+_DIAGRAM_TMPL = '''
+        <div class="diagram-container">
+            <h2>Diagram {n}</h2>
+            <div class="mermaid-wrapper">
+                <div class="mermaid" id="diagram-{n}">
+{body}
+                </div>
             </div>
         </div>
-        ''')
+        '''
+
+# Diagram sections after the first, with the newline that separates them
+_NEXT_DIAGRAM_TMPL = '\n' + _DIAGRAM_TMPL
+
+def iter_html_template(title, mermaid_diagrams, source_file, generation_ts):
+    """Yield the UTF-8 HTML page with Mermaid.js integration in chunks, for writing without building it in memory"""
+    count = len(mermaid_diagrams)
+    title = title.encode('utf-8')
+    yield from (
+        _PAGE_HEAD, title,
+        _PAGE_STYLE, title,
+        _PAGE_SOURCE, source_file.encode('utf-8'),
+        _PAGE_COUNT, f"{count} Diagram{_PLURAL[count == 1]}".encode('utf-8'),
+        _PAGE_CONTENT,
+    )
     
-    file_list = '\n'.join(file_links)
+    # Generate diagram sections
+    if mermaid_diagrams:
+        yield _DIAGRAM_TMPL.format(n=1, body=mermaid_diagrams[0].strip()).encode('utf-8')
+        format_next = _NEXT_DIAGRAM_TMPL.format
+        for n, diagram in enumerate(mermaid_diagrams[1:], 2):
+            yield format_next(n=n, body=diagram.strip()).encode('utf-8')
     
-    index_html = f'''<!DOCTYPE html>
+    yield from (
+        _PAGE_FOOTER, generation_ts.encode('utf-8'),
+        _PAGE_TAIL,
+    )
+
+def create_html_template(title, mermaid_diagrams, source_file, generation_ts):
+    """Create HTML template with Mermaid.js integration"""
+    return b''.join(iter_html_template(title, mermaid_diagrams, source_file, generation_ts)).decode('utf-8')
+
+# Static parts of the index page; close_index joins them around the file
+# count, diagram total, diagram cards and generation time
+_INDEX_HEAD = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -366,118 +488,118 @@ def create_index_html(output_folder, converted_files):
     <title>Mermaid Diagrams Index</title>
     <style>
         /* Modern index page styling */
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 16px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 3em;
             margin-bottom: 10px;
             font-weight: 300;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .diagram-grid {{
+        .diagram-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
             gap: 30px;
             margin-top: 30px;
-        }}
+        }
         
-        .diagram-card {{
+        .diagram-card {
             background: #f8f9fa;
             border-radius: 12px;
             padding: 25px;
             border: 1px solid #e9ecef;
             transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }}
+        }
         
-        .diagram-card:hover {{
+        .diagram-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .diagram-card h3 {{
+        .diagram-card h3 {
             margin-bottom: 15px;
             font-size: 1.3em;
-        }}
+        }
         
-        .diagram-card h3 a {{
+        .diagram-card h3 a {
             color: #2c3e50;
             text-decoration: none;
-        }}
+        }
         
-        .diagram-card h3 a:hover {{
+        .diagram-card h3 a:hover {
             color: #3498db;
-        }}
+        }
         
-        .diagram-info {{
+        .diagram-info {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 15px;
             font-size: 0.9em;
-        }}
+        }
         
-        .diagram-count {{
+        .diagram-count {
             background: #e74c3c;
             color: white;
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 0.8em;
-        }}
+        }
         
-        .source-file {{
+        .source-file {
             color: #6c757d;
             font-style: italic;
-        }}
+        }
         
-        .diagram-description {{
+        .diagram-description {
             color: #6c757d;
             margin-bottom: 20px;
             font-size: 0.95em;
-        }}
+        }
         
-        .card-actions {{
+        .card-actions {
             text-align: right;
-        }}
+        }
         
-        .view-button {{
+        .view-button {
             display: inline-block;
             padding: 10px 20px;
             background: #3498db;
@@ -486,56 +608,56 @@ def create_index_html(output_folder, converted_files):
             border-radius: 6px;
             transition: background-color 0.3s ease;
             font-size: 0.9em;
-        }}
+        }
         
-        .view-button:hover {{
+        .view-button:hover {
             background: #2980b9;
-        }}
+        }
         
-        .summary {{
+        .summary {
             text-align: center;
             padding: 30px;
             background: #e8f4fd;
             border-radius: 12px;
             margin-bottom: 20px;
-        }}
+        }
         
-        .summary h2 {{
+        .summary h2 {
             color: #2c3e50;
             margin-bottom: 10px;
-        }}
+        }
         
-        .summary .stats {{
+        .summary .stats {
             font-size: 1.1em;
             color: #34495e;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #f8f9fa;
             padding: 20px 40px;
             text-align: center;
             color: #6c757d;
             border-top: 1px solid #e9ecef;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .diagram-grid {{
+        @media (max-width: 768px) {
+            .diagram-grid {
                 grid-template-columns: 1fr;
                 gap: 20px;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .content {{
+            .content {
                 padding: 20px;
-            }}
+            }
             
-            .container {{
+            .container {
                 margin: 10px;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -549,28 +671,153 @@ def create_index_html(output_folder, converted_files):
             <div class="summary">
                 <h2>Diagram Collection Summary</h2>
                 <div class="stats">
-                    <strong>{len(converted_files)}</strong> diagram files • 
-                    <strong>{sum(f['diagram_count'] for f in converted_files)}</strong> total diagrams
+                    <strong>'''
+
+_INDEX_TOTAL = '''</strong> diagram files • 
+                    <strong>'''
+
+_INDEX_CARDS = '''</strong> total diagrams
                 </div>
             </div>
             
             <div class="diagram-grid">
-                {file_list}
+                '''
+
+_INDEX_FOOTER = '''
             </div>
         </div>
         
         <div class="footer">
-            <p>Generated on {datetime.now().strftime("%B %d, %Y at %I:%M %p")}</p>
+            <p>Generated on '''
+
+_INDEX_TAIL = '''</p>
             <p>Powered by <a href="https://mermaid.js.org/" target="_blank">Mermaid.js</a></p>
         </div>
     </div>
 </body>
 </html>'''
+
+# One diagram card on the index page, filled in with str.format
+_INDEX_CARD_TMPL = '''
+        <div class="diagram-card">
+            <h3><a href="{filename}">{title}</a></h3>
+            <div class="diagram-info">
+                <span class="diagram-count">{diagram_count} diagram{s}</span>
+                <span class="source-file">Source: {source}</span>
+            </div>
+            <p class="diagram-description">Interactive Mermaid diagram visualization</p>
+            <div class="card-actions">
+                <a href="{filename}" class="view-button">View Diagrams</a>
+            </div>
+        </div>
+        '''
+
+# The index is written in binary mode too
+_INDEX_HEAD, _INDEX_TOTAL, _INDEX_CARDS, _INDEX_FOOTER, _INDEX_TAIL = (
+    part.encode('utf-8') for part in (_INDEX_HEAD, _INDEX_TOTAL, _INDEX_CARDS, _INDEX_FOOTER, _INDEX_TAIL)
+)
+
+def open_index():
+    """Open a temporary file that collects index cards as files are converted"""
+    import tempfile
+    return tempfile.TemporaryFile()
+
+def append_index_card(cards, file_info):
+    """Write one converted file's card to the index card file"""
+    diagram_count = file_info['diagram_count']
+    if cards.tell():
+        cards.write(b'\n')
+    cards.write(_INDEX_CARD_TMPL.format(
+        filename=file_info['filename'],
+        title=file_info['title'],
+        diagram_count=diagram_count,
+        s=_PLURAL[diagram_count == 1],
+        source=file_info['source'],
+    ).encode('utf-8'))
+
+def close_index(cards, index_file, total_files, total_diagrams, generation_ts):
+    """Write the index page around the collected cards and discard the card file"""
+    import shutil
+    
+    with cards, open(index_file, 'wb') as f:
+        f.writelines((_INDEX_HEAD, b'%d' % total_files, _INDEX_TOTAL, b'%d' % total_diagrams, _INDEX_CARDS))
+        cards.seek(0)
+        shutil.copyfileobj(cards, f)
+        f.writelines((_INDEX_FOOTER, generation_ts.encode('utf-8'), _INDEX_TAIL))
+
+def _file_digest(path):
+    """Hash a file's contents for the conversion cache"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_cache(output_path, template_digest):
+    """Load the per-file cache saved in output_path, or an empty one if it is missing or stale"""
+    try:
+        cache = json.loads((output_path / _CACHE_FILE).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('template') != template_digest:
+        return {}
+    return cache.get('files', {})
+
+def _save_cache(output_path, template_digest, files):
+    """Persist the per-file cache so re-runs skip unchanged files"""
+    cache = {'template': template_digest, 'files': files}
+    (output_path / _CACHE_FILE).write_text(json.dumps(cache, indent=1), encoding='utf-8')
+
+def _process_one(md_file, output_path, generation_ts, cached=None):
+    """Convert one markdown file; return its index entry (None if skipped), log lines and cache entry"""
+    log = [f"📖 Processing: {md_file.name}"]
     
-    return index_html
+    try:
+        # Reuse the previous result when the source is unchanged and its page still exists
+        digest = _file_digest(md_file)
+        if cached is not None and cached['hash'] == digest:
+            file_info = cached['info']
+            if file_info is None:
+                log.append(f"⚠️  No Mermaid diagrams found in {md_file.name}")
+                return None, log, cached
+            if (output_path / file_info['filename']).is_file():
+                log.append(f"⏭️  Unchanged: {file_info['filename']}")
+                return file_info, log, cached
+        
+        # Extract title and mermaid diagrams
+        title, mermaid_diagrams = read_title_and_mermaid(md_file)
+        
+        if not mermaid_diagrams:
+            log.append(f"⚠️  No Mermaid diagrams found in {md_file.name}")
+            return None, log, {'hash': digest, 'info': None}
+        
+        log.append(f"✨ Found {len(mermaid_diagrams)} diagram(s) in {md_file.name}")
+        
+        # Write the HTML file as it is generated
+        output_file = output_path / f"{md_file.stem}.html"
+        with open(output_file, 'wb') as f:
+            f.writelines(iter_html_template(title, mermaid_diagrams, md_file.name, generation_ts))
+        
+        log.append(f"✅ Created: {output_file.name}")
+        
+        # Track conversion info
+        file_info = {
+            'filename': output_file.name,
+            'title': title,
+            'diagram_count': len(mermaid_diagrams),
+            'source': md_file.name
+        }
+        return file_info, log, {'hash': digest, 'info': file_info}
+        
+    except Exception as e:
+        log.append(f"❌ Error processing {md_file.name}: {e}")
+        return None, log, None
 
 def convert_mermaid_files(input_folder, output_folder):
     """Convert all mermaid files in input folder to HTML in output folder"""
+    # Imported here so --help and --version do not pay for them
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    from datetime import datetime
     
     input_path = Path(input_folder)
     output_path = Path(output_folder)
@@ -578,12 +825,16 @@ def convert_mermaid_files(input_folder, output_folder):
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
     
-    if not input_path.exists():
+    if not input_path.is_dir():
         print(f"❌ Error: Input folder '{input_folder}' does not exist")
         return False
     
-    # Find all markdown files
-    markdown_files = list(input_path.glob("*.md"))
+    # Find all markdown files in a single directory scan
+    with os.scandir(input_path) as entries:
+        markdown_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.endswith('.md') and entry.is_file()
+        ]
     
     if not markdown_files:
         print(f"❌ No markdown files found in '{input_folder}'")
@@ -591,77 +842,76 @@ def convert_mermaid_files(input_folder, output_folder):
     
     print(f"🔍 Found {len(markdown_files)} markdown files")
     
-    converted_files = []
-    total_diagrams = 0
+    # Results from the previous run, valid only while this script is unchanged
+    template_digest = _file_digest(Path(__file__))
+    cache = _load_cache(output_path, template_digest)
     
-    for md_file in markdown_files:
-        print(f"📖 Processing: {md_file.name}")
-        
-        try:
-            # Read markdown file
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract mermaid diagrams
-            mermaid_diagrams = extract_mermaid_from_markdown(content)
-            
-            if not mermaid_diagrams:
-                print(f"⚠️  No Mermaid diagrams found in {md_file.name}")
-                continue
-            
-            # Extract title
-            title = extract_title_from_markdown(content)
-            
-            print(f"✨ Found {len(mermaid_diagrams)} diagram(s) in {md_file.name}")
-            
-            # Create HTML content
-            html_content = create_html_template(title, mermaid_diagrams, md_file.name)
-            
-            # Write HTML file
-            output_file = output_path / f"{md_file.stem}.html"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"✅ Created: {output_file.name}")
-            
-            # Track conversion info
-            converted_files.append({
-                'filename': output_file.name,
-                'title': title,
-                'diagram_count': len(mermaid_diagrams),
-                'source': md_file.name
-            })
-            
-            total_diagrams += len(mermaid_diagrams)
+    # Every page of this run shows the same generation time
+    generation_ts = datetime.now().strftime(_TIMESTAMP_FORMAT)
+    
+    # Convert the files concurrently, reporting each one as it finishes. Large batches
+    # use worker processes; for a few files threads overlap the reads and writes
+    # without the cost of starting processes
+    if len(markdown_files) >= _PARALLEL_MIN_FILES:
+        executor = ProcessPoolExecutor()
+    else:
+        executor = ThreadPoolExecutor(max_workers=_IO_WORKERS)
+    
+    # Index cards are written as files finish, holding back only those that
+    # finish ahead of an earlier file so the index stays in input order
+    cards = open_index()
+    finished = {}
+    next_card = 0
+    converted_count = 0
+    total_diagrams = 0
+    cache_entries = {}
+    with executor:
+        futures = {
+            executor.submit(_process_one, md_file, output_path, generation_ts, cache.get(md_file.name)): i
+            for i, md_file in enumerate(markdown_files)
+        }
+        for future in as_completed(futures):
+            file_info, log, cache_entry = future.result()
+            print('\n'.join(log))
+            i = futures[future]
+            finished[i] = file_info
+            if cache_entry is not None:
+                cache_entries[markdown_files[i].name] = cache_entry
             
-        except Exception as e:
-            print(f"❌ Error processing {md_file.name}: {e}")
-            continue
+            while next_card in finished:
+                file_info = finished.pop(next_card)
+                next_card += 1
+                if file_info is not None:
+                    append_index_card(cards, file_info)
+                    converted_count += 1
+                    total_diagrams += file_info['diagram_count']
     
-    if converted_files:
+    _save_cache(output_path, template_digest, cache_entries)
+    
+    if converted_count:
         # Create index page
-        index_content = create_index_html(output_folder, converted_files)
         index_file = output_path / "index.html"
-        
-        with open(index_file, 'w', encoding='utf-8') as f:
-            f.write(index_content)
+        close_index(cards, index_file, converted_count, total_diagrams, generation_ts)
         
         print(f"📋 Created index: {index_file.name}")
         
         print(f"\n🎉 Conversion complete!")
         print(f"📊 Summary:")
-        print(f"   • {len(converted_files)} files converted")
+        print(f"   • {converted_count} files converted")
         print(f"   • {total_diagrams} diagrams processed")
         print(f"   • Output folder: {output_folder}")
         print(f"   • Open {output_path}/index.html in your browser")
         
         return True
     else:
+        cards.close()
         print("❌ No files were successfully converted")
         return False
 
 def main():
     """Main function"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Convert Mermaid diagrams from markdown files to interactive HTML',
         formatter_class=argparse.RawDescriptionHelpFormatter,
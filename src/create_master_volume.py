@@ -27,11 +27,13 @@ Options:
     --order-file  Path to a file listing chapter filenames in desired order
     --html-only   Generate only HTML output (no EPUB)
     --epub-only   Generate only EPUB output (no HTML)
+    --gzip        Write the HTML output gzip-compressed (.html.gz)
     
 Example:
     python3 create_master_volume.py --dir docs/book-chapters --title "My Complete Guide" --author "John Smith"
 """
 
+import functools
 import os
 import re
 import sys
@@ -39,6 +41,7 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 import uuid
+from dataclasses import dataclass
 
 # Import shared functions from generate_kindle.py
 try:
@@ -60,21 +63,35 @@ except ImportError:
     sys.exit(1)
 
 
-def generate_html_master_volume(markdown_files, output_file, title, author):
-    """Generate a master HTML file from multiple markdown files"""
-    
-    html_parts = [
-        '<!DOCTYPE html>',
-        '<html lang="en">',
-        '<head>',
-        f'<title>{escape_html(title)}</title>',
-        '<meta charset="UTF-8">',
-        '<meta name="viewport" content="width=device-width, initial-scale=1.0">',
-        f'<meta name="author" content="{escape_html(author)}">',
-        '<style>',
-        create_kindle_styles(),
-        # Additional HTML-specific styling
-        '''
+# Output buffer size; chapters are written as they are rendered, not joined first
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Chapter titles appear in both the TOC and the chapter heading, so escape each once
+_escape_title = functools.lru_cache(maxsize=4096)(escape_html)
+
+# Threads reading chapter files; reads are I/O-bound and release the GIL
+_READ_WORKERS = 32
+
+# Below this many chapters the HTML is rendered serially instead of in worker processes
+_PARALLEL_MIN_CHAPTERS = 8
+
+# Markdown header lines: level markers and header text; the whitespace
+# after the markers may not run onto the next line
+_HEADER_RE = re.compile(r'^(#{1,6})[^\S\n]+(.+)$', re.MULTILINE)
+
+# Level-1 heading line: the first is replaced by the chapter title, the rest are demoted
+_H1_RE = re.compile(r'^# (.+)$', re.MULTILINE)
+
+@dataclass(slots=True)
+class Chapter:
+    """Title, anchor and headers of one chapter of the master volume, used for the TOC and the body"""
+    title: str
+    anchor: str
+    headers: list
+
+
+# HTML-only styles appended to the shared Kindle stylesheet
+_HTML_STYLES = '''
         /* Additional HTML-specific styles */
         body {
             max-width: 900px;
@@ -130,124 +147,181 @@ def generate_html_master_volume(markdown_files, output_file, title, author):
                 page-break-before: avoid;
             }
         }
-        ''',
-        '</style>',
-        '</head>',
-        '<body>',
-        f'<h1 id="title">{escape_html(title)}</h1>',
-        f'<p class="author">by {escape_html(author)}</p>',
-    ]
+        '''
+
+# Full stylesheet of the HTML volume, built once at import
+_HTML_CSS = create_kindle_styles() + '\n' + _HTML_STYLES
+
+# Document head and title block, filled in with str.format
+_HEAD_TEMPLATE = (
+    '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+    '<title>{title}</title>\n'
+    '<meta charset="UTF-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    '<meta name="author" content="{author}">\n'
+    '<style>\n{css}\n</style>\n</head>\n<body>\n'
+    '<h1 id="title">{title}</h1>\n'
+    '<p class="author">by {author}</p>\n'
+)
+
+# Closes each chapter, followed by a back-to-top link
+_CHAPTER_END = (
+    '\n</div>\n'
+    '<p><a href="#table-of-contents" class="toc-link">↑ Back to Table of Contents</a></p>\n'
+)
+
+
+def _chapter_outline(i, file_path, content):
+    """Read one chapter's title and headers for the table of contents"""
+    chapter_anchor = f"chapter-{i+1}"
     
-    # Collect all headers for the table of contents
-    all_headers = []
-    toc_entries = []
+    # Extract title from content or filename
+    chapter_title = extract_title_from_content(content)
+    if chapter_title == "Document":
+        chapter_title = Path(file_path).stem.replace('-', ' ').replace('_', ' ').title()
     
-    # Process files and collect headers
-    for i, (file_path, content) in enumerate(markdown_files):
-        # Extract title from content or filename
-        chapter_title = extract_title_from_content(content)
-        if chapter_title == "Document":
-            chapter_title = Path(file_path).stem.replace('-', ' ').replace('_', ' ').title()
-        
-        # Extract headers for TOC
-        headers = []
-        lines = content.split('\n')
-        for line in lines:
-            match = re.match(r'^(#{1,6})\s+(.+)$', line)
-            if match:
-                level = len(match.group(1))
-                title = match.group(2).strip()
-                anchor_id = f"chapter-{i+1}-{create_anchor_id(title)}"
-                headers.append((level, title, anchor_id))
-        
-        all_headers.append((chapter_title, str(file_path), headers))
-        
-        # Create TOC entry
-        chapter_anchor = f"chapter-{i+1}"
-        toc_entries.append((1, chapter_title, chapter_anchor))
-        
-        # Add nested headers to TOC 
-        for level, title, anchor_id in headers:
-            if level > 1 and level <= 3:  # Only include h2 and h3 in TOC
-                toc_entries.append((level, title, anchor_id))
+    # Extract headers for TOC
+    headers = []
+    for match in _HEADER_RE.finditer(content):
+        level = len(match.group(1))
+        header_title = match.group(2).strip()
+        anchor_id = f"{chapter_anchor}-{create_anchor_id(header_title)}"
+        headers.append((level, header_title, anchor_id))
     
-    # Generate table of contents
-    html_parts.append('<div id="table-of-contents">')
-    html_parts.append('<h2>Table of Contents</h2>')
-    html_parts.append('<ul>')
+    return Chapter(chapter_title, chapter_anchor, headers)
+
+
+def _render_chapter(item):
+    """Render one chapter's HTML; module-level so worker processes can run it"""
+    i, (file_path, content) = item
+    seen_h1 = False
     
-    current_level = 1
-    list_stack = [1]  # Start with the main list level
+    def promote_h1(match):
+        nonlocal seen_h1
+        if not seen_h1:
+            seen_h1 = True
+            return ''
+        return '## ' + match.group(1)
     
-    for level, title, anchor_id in toc_entries:
-        # Handle list nesting
-        while level > current_level:
-            html_parts.append('<ul>')
-            list_stack.append(current_level)
-            current_level += 1
-        
-        while level < current_level:
-            html_parts.append('</ul>')
-            current_level = list_stack.pop()
-        
-        html_parts.append(f'<li><a href="#{anchor_id}">{escape_html(title)}</a></li>')
+    # Drop the first h1 and replace the others with h2 to maintain hierarchy, in one pass
+    content_modified = _H1_RE.sub(promote_h1, content)
     
-    # Close any remaining lists
-    while len(list_stack) > 0:
-        html_parts.append('</ul>')
-        list_stack.pop()
+    # Convert the content to HTML, with header IDs made chapter-specific
+    return simple_markdown_to_html(content_modified, anchor_prefix=f"chapter-{i+1}-")
+
+
+def outline_chapters(markdown_files):
+    """Read each chapter's title and headers, shared by the HTML and EPUB outputs"""
+    return [
+        _chapter_outline(i, file_path, content)
+        for i, (file_path, content) in enumerate(markdown_files)
+    ]
+
+
+def generate_html_master_volume(markdown_files, output_file, title, author, chapters=None):
+    """Generate a master HTML file from multiple markdown files"""
     
-    html_parts.append('</div>')  # End table of contents
+    # Read each chapter's title and headers up front; the TOC comes before the bodies
+    if chapters is None:
+        chapters = outline_chapters(markdown_files)
     
-    # Process each file and add content
-    for i, (file_path, content) in enumerate(markdown_files):
-        # Extract title
-        chapter_title = extract_title_from_content(content)
-        if chapter_title == "Document":
-            chapter_title = Path(file_path).stem.replace('-', ' ').replace('_', ' ').title()
-        
-        # Start new chapter
-        chapter_anchor = f"chapter-{i+1}"
-        html_parts.append(f'<div class="chapter" id="{chapter_anchor}">')
-        
-        # Replace h1 headings with h2 to maintain hierarchy
-        content_modified = re.sub(r'^# (.+)$', '', content, flags=re.MULTILINE, count=1)
-        content_modified = re.sub(r'^# (.+)$', r'## \1', content_modified, flags=re.MULTILINE)
-        
-        # Add chapter heading
-        html_parts.append(f'<h1 class="chapter-title">{escape_html(chapter_title)}</h1>')
-        
-        # Convert the content to HTML
-        chapter_html = simple_markdown_to_html(content_modified)
-        
-        # Fix anchor IDs to be chapter-specific
-        for level, title, anchor_id in all_headers[i][2]:
-            old_id = create_anchor_id(title)
-            new_id = f"chapter-{i+1}-{old_id}"
-            chapter_html = chapter_html.replace(f'id="{old_id}"', f'id="{new_id}"')
+    # Build the table of contents as a tree of (title, anchor, children) nodes,
+    # with each chapter's headers nested under the nearest shallower one
+    toc_tree = []
+    for chapter in chapters:
+        children = []
+        toc_tree.append((chapter.title, chapter.anchor, children))
         
-        html_parts.append(chapter_html)
-        html_parts.append('</div>')  # End chapter div
-        
-        # Add back-to-top link
-        html_parts.append('<p><a href="#table-of-contents" class="toc-link">↑ Back to Table of Contents</a></p>')
-    
-    # Add footer
-    html_parts.append('<footer>')
-    html_parts.append(f'<p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")}</p>')
-    html_parts.append('</footer>')
+        # Add nested headers to TOC 
+        parents = [(1, children)]
+        for level, header_title, anchor_id in chapter.headers:
+            if level > 1 and level <= 3:  # Only include h2 and h3 in TOC
+                while parents[-1][0] >= level:
+                    parents.pop()
+                children = []
+                parents[-1][1].append((header_title, anchor_id, children))
+                parents.append((level, children))
     
-    html_parts.append('</body>')
-    html_parts.append('</html>')
+    # Chapter bodies are rendered lazily and in order, each written out as it
+    # arrives; larger books render them in worker processes meanwhile
+    executor = None
+    if len(markdown_files) >= _PARALLEL_MIN_CHAPTERS:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor()
+        chapter_htmls = executor.map(_render_chapter, enumerate(markdown_files))
+    else:
+        chapter_htmls = map(_render_chapter, enumerate(markdown_files))
     
-    # Write the final HTML file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(html_parts))
+    try:
+        _write_html_master_volume(output_file, chapters, chapter_htmls, toc_tree, title, author)
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     print(f"✅ Generated HTML master volume: {output_file}")
     return output_file
 
 
+def _write_toc(write, nodes):
+    """Write one level of the table of contents tree as a nested list"""
+    escape_title = _escape_title
+    write('<ul>\n')
+    for entry_title, anchor_id, children in nodes:
+        write(f'<li><a href="#{anchor_id}">{escape_title(entry_title)}</a>')
+        if children:
+            write('\n')
+            _write_toc(write, children)
+        write('</li>\n')
+    write('</ul>\n')
+
+
+def _write_html_master_volume(output_file, chapters, chapter_htmls, toc_tree, title, author):
+    """Write the master HTML file, streaming each chapter body to disk as it arrives"""
+    if str(output_file).endswith('.gz'):
+        # Fastest compression level; the output is still several times smaller
+        import gzip
+        f = gzip.open(output_file, 'wt', encoding='utf-8', compresslevel=1)
+    else:
+        f = open(output_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+    
+    with f:
+        write = f.write
+        
+        write(_HEAD_TEMPLATE.format(title=escape_html(title), author=escape_html(author), css=_HTML_CSS))
+        
+        # Generate table of contents
+        write('<div id="table-of-contents">\n<h2>Table of Contents</h2>\n')
+        _write_toc(write, toc_tree)
+        write('</div>\n')  # End table of contents
+        
+        # Process each file and add content
+        for chapter, chapter_html in zip(chapters, chapter_htmls):
+            # Start new chapter with its heading
+            write(
+                f'<div class="chapter" id="{chapter.anchor}">\n'
+                f'<h1 class="chapter-title">{_escape_title(chapter.title)}</h1>\n'
+            )
+            write(chapter_html)
+            write(_CHAPTER_END)
+        
+        # Add footer
+        write(
+            '<footer>\n'
+            f'<p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M")}</p>\n'
+            '</footer>\n'
+            '</body>\n</html>'
+        )
+
+
+def _read_markdown_file(file_path):
+    """Read one chapter file; return its content, or None and the error if it could not be read"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read(), None
+    except Exception as e:
+        return None, e
+
+
 def read_order_file(order_file_path):
     """Read a file containing chapter filenames in the desired order"""
     try:
@@ -280,6 +354,7 @@ Examples:
     parser.add_argument('--order-file', help='File containing chapter filenames in desired order')
     parser.add_argument('--html-only', action='store_true', help='Generate only HTML output')
     parser.add_argument('--epub-only', action='store_true', help='Generate only EPUB output')
+    parser.add_argument('--gzip', action='store_true', help='Write the HTML output gzip-compressed (.html.gz)')
     parser.add_argument('--version', action='version', version='Master Volume Generator 1.0')
     
     args = parser.parse_args()
@@ -304,14 +379,14 @@ Examples:
     print(f"📊 Title: {title}")
     print(f"✍️  Author: {args.author}")
     
-    # Find all markdown files
-    markdown_files = []
-    for pattern in ['*.md', '*.markdown']:
-        files = list(dir_path.glob(pattern))
-        if args.prefix:
-            # Filter by prefix
-            files = [f for f in files if f.name.startswith(args.prefix)]
-        markdown_files.extend(files)
+    # Find all markdown files in a single directory scan, filtering by prefix
+    with os.scandir(dir_path) as entries:
+        markdown_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(('.md', '.markdown'))
+            and (not args.prefix or entry.name.startswith(args.prefix))
+            and entry.is_file()
+        ]
     
     if not markdown_files:
         print(f"❌ No markdown files found in {dir_path}" + 
@@ -327,18 +402,21 @@ Examples:
         
         ordered_filenames = read_order_file(order_file_path)
         if ordered_filenames:
-            # Map filenames to full paths and filter to include only existing files
+            # Map filenames to full paths and filter to include only existing files,
+            # taking each listed file out of the remaining ones as it is placed
+            files_by_name = {f.name: f for f in markdown_files}
+            remaining_by_name = dict(files_by_name)
             ordered_files = []
             for filename in ordered_filenames:
-                matching_files = [f for f in markdown_files if f.name == filename]
-                if matching_files:
-                    ordered_files.append(matching_files[0])
+                matching_file = files_by_name.get(filename)
+                if matching_file is not None:
+                    ordered_files.append(matching_file)
+                    remaining_by_name.pop(filename, None)
                 else:
                     print(f"⚠️  Warning: File in order list not found: {filename}")
             
             # Add any files that weren't in the order file at the end
-            ordered_filenames_set = set(ordered_filenames)
-            remaining_files = [f for f in markdown_files if f.name not in ordered_filenames_set]
+            remaining_files = list(remaining_by_name.values())
             
             if remaining_files:
                 print(f"ℹ️  {len(remaining_files)} files not in order file will be added at the end")
@@ -356,18 +434,20 @@ Examples:
     for i, file_path in enumerate(markdown_files):
         print(f"   {i+1}. {file_path.name}")
     
-    # Read all files
+    # Read all files concurrently; map keeps them in chapter order
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+        results = list(executor.map(_read_markdown_file, markdown_files))
+    
     file_contents = []
-    for file_path in markdown_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if not content or len(content.strip()) < 10:
-                    print(f"⚠️  Warning: File appears empty or too short: {file_path}")
-                    continue
-                file_contents.append((str(file_path), content))
-        except Exception as e:
-            print(f"⚠️  Warning: Could not read {file_path}: {e}")
+    for file_path, (content, error) in zip(markdown_files, results):
+        if error is not None:
+            print(f"⚠️  Warning: Could not read {file_path}: {error}")
+            continue
+        if not content or len(content.strip()) < 10:
+            print(f"⚠️  Warning: File appears empty or too short: {file_path}")
+            continue
+        file_contents.append((str(file_path), content))
     
     if not file_contents:
         print("❌ No valid markdown files could be read")
@@ -375,16 +455,22 @@ Examples:
     
     output_files = []
     
+    # Chapter titles are worked out once for both outputs
+    chapters = outline_chapters(file_contents)
+    
     # Generate HTML output
     if not args.epub_only:
-        html_filename = output_dir / f"{title.replace(' ', '_')}.html"
-        html_file = generate_html_master_volume(file_contents, html_filename, title, args.author)
+        html_filename = output_dir / f"{title.replace(' ', '_')}.html{'.gz' if args.gzip else ''}"
+        html_file = generate_html_master_volume(file_contents, html_filename, title, args.author, chapters)
         output_files.append(("HTML", html_file))
     
     # Generate EPUB output
     if not args.html_only:
         epub_filename = output_dir / f"{title.replace(' ', '_')}.epub"
-        epub_file = create_epub_book(file_contents, epub_filename, title, args.author)
+        epub_file = create_epub_book(
+            file_contents, epub_filename, title, args.author,
+            chapter_titles=[chapter.title for chapter in chapters]
+        )
         output_files.append(("EPUB", epub_file))
     
     # Show summary
@@ -19,52 +19,89 @@ Usage:
   python3 generate_html_flexible.py --dir docs/ --separate --title "My Documentation"
 """
 
-import os
+import functools
+import hashlib
 import re
 import sys
 import argparse
 from pathlib import Path
 from datetime import datetime
 
+# Below this many files, --separate converts them serially instead of in worker processes
+_PARALLEL_MIN_FILES = 8
+
+# Date shown in the footer of each generated document
+_DATE_FORMAT = "%B %d, %Y"
+
+# Folder in the output directory holding HTML rendered by earlier --cache runs
+_CACHE_DIR = '.md_html_cache'
+
+# Markdown patterns, compiled once at import instead of looked up on every call
+_HEADER_RE = re.compile(r'^(#{1,5}) (.*?)$', re.MULTILINE)
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)\n```', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_BOLD_ITALIC_RE = re.compile(r'\*\*\*(.*?)\*\*\*')
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_OL_RE = re.compile(r'^(\d+)\. (.*?)$', re.MULTILINE)
+_UL_RE = re.compile(r'^[-*+] (.*?)$', re.MULTILINE)
+_LIST_WRAP_RE = re.compile(r'(<li>.*?</li>(?:\s*<li>.*?</li>)*)', re.DOTALL)
+_BLOCKQUOTE_RE = re.compile(r'^> (.*?)$', re.MULTILINE)
+_HR_RE = re.compile(r'^---+$', re.MULTILINE)
+
+# Anchor id cleanup: HTML tags, punctuation, and runs of spaces or hyphens
+_ANCHOR_STRIP_TAGS_RE = re.compile(r'<[^>]+>')
+_ANCHOR_NONWORD_RE = re.compile(r'[^\w\s-]')
+_ANCHOR_DASHSPACE_RE = re.compile(r'[-\s]+')
+
+# HTML special characters and their entities
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# A numbered list marker, used to tell ordered lists from bullet lists
+_OL_MARKER_RE = re.compile(r'\d+\.\s')
+
+# Markdown table separator row, e.g. |---|:-:|
+_TABLE_SEP_RE = re.compile(r'^\|[-:\s|]+\|$')
+
+# A run of consecutive lines that start and end with '|', ignoring surrounding whitespace
+_TABLE_BLOCK_RE = re.compile(r'^[^\S\n]*\|(?:.*\|)?[^\S\n]*(?:\n[^\S\n]*\|(?:.*\|)?[^\S\n]*)*$', re.MULTILINE)
+
 def simple_markdown_to_html(markdown_content):
     """Enhanced markdown to HTML conversion using regex"""
     html = markdown_content
     
-    # Convert headers (with IDs for table of contents)
-    html = re.sub(r'^# (.*?)$', lambda m: f'<h1 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h1>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.*?)$', lambda m: f'<h2 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^### (.*?)$', lambda m: f'<h3 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^#### (.*?)$', lambda m: f'<h4 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h4>', html, flags=re.MULTILINE)
-    html = re.sub(r'^##### (.*?)$', lambda m: f'<h5 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h5>', html, flags=re.MULTILINE)
+    # Convert headers h1-h5 in one pass (with IDs for table of contents)
+    html = _HEADER_RE.sub(header_to_html, html)
     
     # Convert code blocks with language support
-    html = re.sub(r'```(\w+)?\n(.*?)\n```', lambda m: f'<pre><code class="language-{m.group(1) or "text"}">{escape_html(m.group(2))}</code></pre>', html, flags=re.DOTALL)
+    html = _CODE_BLOCK_RE.sub(lambda m: f'<pre><code class="language-{m.group(1) or "text"}">{escape_html(m.group(2))}</code></pre>', html)
     
     # Convert inline code
-    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
+    html = _INLINE_CODE_RE.sub(r'<code>\1</code>', html)
     
     # Convert bold and italic
-    html = re.sub(r'\*\*\*(.*?)\*\*\*', r'<strong><em>\1</em></strong>', html)
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-    html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
+    html = _BOLD_ITALIC_RE.sub(r'<strong><em>\1</em></strong>', html)
+    html = _BOLD_RE.sub(r'<strong>\1</strong>', html)
+    html = _ITALIC_RE.sub(r'<em>\1</em>', html)
     
     # Convert links
-    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', html)
+    html = _LINK_RE.sub(r'<a href="\2">\1</a>', html)
     
     # Convert numbered lists
-    html = re.sub(r'^(\d+)\. (.*?)$', r'<li>\2</li>', html, flags=re.MULTILINE)
+    html = _OL_RE.sub(r'<li>\2</li>', html)
     
     # Convert bullet lists
-    html = re.sub(r'^[-*+] (.*?)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    html = _UL_RE.sub(r'<li>\1</li>', html)
     
     # Wrap consecutive list items in ul/ol tags
-    html = re.sub(r'(<li>.*?</li>(?:\s*<li>.*?</li>)*)', wrap_list_items, html, flags=re.DOTALL)
+    html = _LIST_WRAP_RE.sub(wrap_list_items, html)
     
     # Convert blockquotes
-    html = re.sub(r'^> (.*?)$', r'<blockquote>\1</blockquote>', html, flags=re.MULTILINE)
+    html = _BLOCKQUOTE_RE.sub(r'<blockquote>\1</blockquote>', html)
     
     # Convert horizontal rules
-    html = re.sub(r'^---+$', '<hr>', html, flags=re.MULTILINE)
+    html = _HR_RE.sub('<hr>', html)
     
     # Convert tables (basic support)
     html = convert_tables(html)
@@ -83,25 +120,57 @@ def simple_markdown_to_html(markdown_content):
     
     return '\n\n'.join(html_paragraphs)
 
+@functools.lru_cache(maxsize=None)
+def _converter_digest():
+    """Hash this script, so cached HTML is not reused once the converter changes"""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).digest()
+
+def convert_markdown(markdown_content, cache_dir=None):
+    """Convert markdown to HTML, reusing the cached HTML of identical content when cache_dir is given"""
+    if cache_dir is None:
+        return simple_markdown_to_html(markdown_content)
+    
+    key = hashlib.blake2b(markdown_content.encode('utf-8'), digest_size=16, key=_converter_digest()).hexdigest()
+    cache_file = cache_dir / f'{key}.html'
+    try:
+        return cache_file.read_bytes().decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        pass
+    
+    html = simple_markdown_to_html(markdown_content)
+    
+    # Write through a temporary file so parallel workers never read a partial entry
+    import tempfile
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as f:
+        f.write(html.encode('utf-8'))
+    Path(f.name).replace(cache_file)
+    return html
+
+def header_to_html(match):
+    """Turn a markdown header match into an h1-h5 tag with an anchor ID"""
+    level = len(match.group(1))
+    text = match.group(2)
+    return f'<h{level} id="{create_anchor_id(text)}">{text}</h{level}>'
+
 def create_anchor_id(text):
     """Create a URL-friendly anchor ID from header text"""
     # Remove HTML tags and convert to lowercase
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _ANCHOR_STRIP_TAGS_RE.sub('', text)
     text = text.lower()
     # Replace spaces with hyphens and remove special characters
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
+    text = _ANCHOR_NONWORD_RE.sub('', text)
+    text = _ANCHOR_DASHSPACE_RE.sub('-', text)
     return text.strip('-')
 
 def escape_html(text):
     """Escape HTML special characters"""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 def wrap_list_items(match):
     """Wrap list items in appropriate ul or ol tags"""
     content = match.group(1)
     # Check if it's a numbered list by looking for patterns like "1. " in the original
-    if re.search(r'\d+\.\s', content):
+    if _OL_MARKER_RE.search(content):
         return f'<ol>{content}</ol>'
     else:
         return f'<ul>{content}</ul>'
@@ -118,50 +187,55 @@ def contains_block_elements(text):
 
 def convert_tables(html):
     """Convert markdown tables to HTML tables"""
-    lines = html.split('\n')
-    result = []
-    in_table = False
-    
-    for i, line in enumerate(lines):
-        if '|' in line and line.strip().startswith('|') and line.strip().endswith('|'):
-            if not in_table:
-                result.append('<table>')
-                in_table = True
-                # Check if next line is separator
-                if i + 1 < len(lines) and re.match(r'^\|[-:\s|]+\|$', lines[i + 1].strip()):
-                    result.append('<thead>')
-                    result.append('<tr>')
-                    cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
-                    for cell in cells:
-                        result.append(f'<th>{cell}</th>')
-                    result.append('</tr>')
-                    result.append('</thead>')
-                    result.append('<tbody>')
-                    continue
-                else:
-                    result.append('<tbody>')
-            
-            # Skip separator lines
-            if re.match(r'^\|[-:\s|]+\|$', line.strip()):
-                continue
-                
-            # Process table row
-            result.append('<tr>')
-            cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
-            for cell in cells:
-                result.append(f'<td>{cell}</td>')
-            result.append('</tr>')
+    # Only lines containing '|' can start a table, so jump between those
+    parts = []
+    last = 0
+    pos = html.find('|')
+    while pos >= 0:
+        match = _TABLE_BLOCK_RE.match(html, html.rfind('\n', 0, pos) + 1)
+        if match:
+            parts.append(html[last:match.start()])
+            parts.append(table_to_html(match))
+            last = match.end()
+            pos = html.find('|', last)
         else:
-            if in_table:
-                result.append('</tbody>')
-                result.append('</table>')
-                in_table = False
-            result.append(line)
+            line_end = html.find('\n', pos)
+            pos = html.find('|', line_end) if line_end >= 0 else -1
     
-    if in_table:
-        result.append('</tbody>')
-        result.append('</table>')
+    if not parts:
+        return html
+    parts.append(html[last:])
+    return ''.join(parts)
+
+def table_to_html(match):
+    """Convert one run of markdown table lines to an HTML table"""
+    lines = [line.strip() for line in match.group(0).split('\n')]
+    result = ['<table>']
+    
+    # A separator after the first line makes it the header row
+    if len(lines) > 1 and _TABLE_SEP_RE.match(lines[1]):
+        result.append('<thead>')
+        result.append('<tr>')
+        for cell in lines[0].split('|')[1:-1]:
+            result.append(f'<th>{cell.strip()}</th>')
+        result.append('</tr>')
+        result.append('</thead>')
+        lines = lines[1:]
+    result.append('<tbody>')
     
+    for line in lines:
+        # Skip separator lines
+        if _TABLE_SEP_RE.match(line):
+            continue
+        
+        # Process table row
+        result.append('<tr>')
+        for cell in line.split('|')[1:-1]:
+            result.append(f'<td>{cell.strip()}</td>')
+        result.append('</tr>')
+    
+    result.append('</tbody>')
+    result.append('</table>')
     return '\n'.join(result)
 
 def extract_toc_from_html(html_content):
@@ -206,8 +280,7 @@ def read_single_file(filepath):
         return None, None
     
     print(f"Reading {path.name}...")
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = path.read_text(encoding='utf-8')
     
     return content, path.stem
 
@@ -228,8 +301,7 @@ def read_multiple_files(directory):
     
     for filepath in md_files:
         print(f"Reading {filepath.name}...")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            file_content = f.read()
+        file_content = filepath.read_text(encoding='utf-8')
         
         # Add a page break before each new file (except the first)
         if combined_content:
@@ -257,8 +329,7 @@ def read_multiple_files_separate(directory):
     
     for filepath in md_files:
         print(f"Reading {filepath.name}...")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = filepath.read_text(encoding='utf-8')
         
         # Extract title from first heading or use filename
         title = extract_title_from_markdown(content) or filepath.stem.replace('-', ' ').replace('_', ' ').title()
@@ -282,31 +353,13 @@ def extract_title_from_markdown(content):
             return line[2:].strip()
     return None
 
-def create_html_document(content, title, include_toc=True):
-    """Create complete HTML document with styling"""
-    
-    current_date = datetime.now().strftime("%B %d, %Y")
-    
-    # Generate table of contents if requested
-    toc_html = ""
-    if include_toc:
-        toc_items = extract_toc_from_html(content)
-        if toc_items:
-            toc_html = generate_toc_html(toc_items)
-    
-    html_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        @page {{
+# Stylesheet of each generated document
+_DOCUMENT_CSS = """        @page {
             size: A4;
             margin: 20mm 15mm;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.6;
             max-width: 100%;
@@ -314,82 +367,82 @@ def create_html_document(content, title, include_toc=True):
             padding: 20px;
             color: #333;
             background: white;
-        }}
+        }
         
-        .title-page {{
+        .title-page {
             text-align: center;
             margin: 100px 0;
             page-break-after: always;
-        }}
+        }
         
-        .title-page h1 {{
+        .title-page h1 {
             font-size: 2.5em;
             color: #2c3e50;
             margin-bottom: 20px;
             border-bottom: none;
-        }}
+        }
         
-        .title-page h2 {{
+        .title-page h2 {
             font-size: 1.5em;
             color: #7f8c8d;
             font-weight: normal;
             margin-bottom: 50px;
             border-bottom: none;
-        }}
+        }
         
-        h1 {{
+        h1 {
             color: #2c3e50;
             border-bottom: 3px solid #3498db;
             padding-bottom: 10px;
             margin-top: 40px;
             font-size: 1.8em;
-        }}
+        }
         
-        h1:first-of-type {{
+        h1:first-of-type {
             margin-top: 0;
-        }}
+        }
         
-        h2 {{
+        h2 {
             color: #34495e;
             border-bottom: 2px solid #ecf0f1;
             padding-bottom: 8px;
             margin-top: 30px;
             font-size: 1.4em;
-        }}
+        }
         
-        h3 {{
+        h3 {
             color: #2980b9;
             margin-top: 25px;
             font-size: 1.2em;
-        }}
+        }
         
-        h4 {{
+        h4 {
             color: #8e44ad;
             margin-top: 20px;
             font-size: 1.1em;
-        }}
+        }
         
-        h5 {{
+        h5 {
             color: #27ae60;
             margin-top: 18px;
             font-size: 1.05em;
-        }}
+        }
         
-        p {{
+        p {
             margin: 12px 0;
             text-align: justify;
-        }}
+        }
         
-        code {{
+        code {
             background-color: #f8f9fa;
             padding: 2px 6px;
             border-radius: 3px;
             font-family: 'SF Mono', Monaco, 'Cascadia Code', 'Roboto Mono', Consolas, 'Courier New', monospace;
             font-size: 0.9em;
             color: #d63384;
-        }}
+        }
         
-        pre {{
+        pre {
             background-color: #f8f9fa;
             border: 1px solid #e9ecef;
             border-radius: 6px;
@@ -397,134 +450,157 @@ def create_html_document(content, title, include_toc=True):
             overflow-x: auto;
             margin: 16px 0;
             white-space: pre-wrap;
-        }}
+        }
         
-        pre code {{
+        pre code {
             background: none;
             padding: 0;
             color: #333;
             font-size: 0.85em;
-        }}
+        }
         
-        ul, ol {{
+        ul, ol {
             margin: 12px 0;
             padding-left: 25px;
-        }}
+        }
         
-        li {{
+        li {
             margin: 6px 0;
-        }}
+        }
         
-        strong {{
+        strong {
             color: #2c3e50;
             font-weight: 600;
-        }}
+        }
         
-        em {{
+        em {
             color: #7f8c8d;
             font-style: italic;
-        }}
+        }
         
-        blockquote {{
+        blockquote {
             border-left: 4px solid #3498db;
             margin: 20px 0;
             padding: 10px 20px;
             background-color: #f8f9fa;
             font-style: italic;
-        }}
+        }
         
-        table {{
+        table {
             border-collapse: collapse;
             width: 100%;
             margin: 20px 0;
-        }}
+        }
         
-        th, td {{
+        th, td {
             border: 1px solid #ddd;
             padding: 12px;
             text-align: left;
-        }}
+        }
         
-        th {{
+        th {
             background-color: #f2f2f2;
             font-weight: bold;
-        }}
+        }
         
-        hr {{
+        hr {
             border: none;
             height: 2px;
             background-color: #ecf0f1;
             margin: 30px 0;
-        }}
+        }
         
-        a {{
+        a {
             color: #3498db;
             text-decoration: none;
-        }}
+        }
         
-        a:hover {{
+        a:hover {
             text-decoration: underline;
-        }}
+        }
         
-        .toc {{
+        .toc {
             background-color: #f8f9fa;
             border: 1px solid #e9ecef;
             border-radius: 6px;
             padding: 20px;
             margin: 20px 0;
             page-break-after: always;
-        }}
+        }
         
-        .toc h2 {{
+        .toc h2 {
             margin-top: 0;
             border-bottom: none;
             color: #2c3e50;
-        }}
+        }
         
-        .toc-list {{
+        .toc-list {
             list-style-type: none;
             padding-left: 0;
-        }}
+        }
         
-        .toc-list li {{
+        .toc-list li {
             margin: 8px 0;
             padding: 5px;
             background: white;
             border-radius: 3px;
-        }}
+        }
         
-        .toc-level-1 {{ font-weight: bold; font-size: 1.1em; }}
-        .toc-level-2 {{ padding-left: 20px; }}
-        .toc-level-3 {{ padding-left: 40px; font-size: 0.95em; }}
-        .toc-level-4 {{ padding-left: 60px; font-size: 0.9em; }}
-        .toc-level-5 {{ padding-left: 80px; font-size: 0.85em; }}
+        .toc-level-1 { font-weight: bold; font-size: 1.1em; }
+        .toc-level-2 { padding-left: 20px; }
+        .toc-level-3 { padding-left: 40px; font-size: 0.95em; }
+        .toc-level-4 { padding-left: 60px; font-size: 0.9em; }
+        .toc-level-5 { padding-left: 80px; font-size: 0.85em; }
         
-        .section-break {{
+        .section-break {
             page-break-before: always;
             height: 0;
-        }}
+        }
         
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 15px;
-            }}
+            }
             
-            .no-print {{
+            .no-print {
                 display: none;
-            }}
+            }
             
-            h1, h2, h3, h4, h5 {{
+            h1, h2, h3, h4, h5 {
                 page-break-after: avoid;
-            }}
+            }
             
-            pre, blockquote {{
+            pre, blockquote {
                 page-break-inside: avoid;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+"""
+
+# Document head around the title, with the stylesheet inlined once at import
+_DOCUMENT_HEAD_START = (
+    '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+    '    <meta charset="UTF-8">\n'
+    '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    '    <title>'
+)
+_DOCUMENT_HEAD_END = '</title>\n    <style>\n' + _DOCUMENT_CSS + '    </style>\n</head>\n<body>'
+
+def create_html_document(content, title, include_toc=True, current_date=None):
+    """Create complete HTML document with styling"""
+    
+    # Callers writing several documents pass one date for the whole run
+    if current_date is None:
+        current_date = datetime.now().strftime(_DATE_FORMAT)
+    
+    # Generate table of contents if requested
+    toc_html = ""
+    if include_toc:
+        toc_items = extract_toc_from_html(content)
+        if toc_items:
+            toc_html = generate_toc_html(toc_items)
+    
+    html_template = f"""{_DOCUMENT_HEAD_START}{title}{_DOCUMENT_HEAD_END}
     {toc_html}
     
     {content}
@@ -538,136 +614,144 @@ def create_html_document(content, title, include_toc=True):
     
     return html_template
 
-def create_index_html(documents_info, output_dir, collection_title="Markdown Documents Collection"):
-    """Create an index HTML file for all documents."""
+def write_separate_document(file_info, output_dir, include_toc=True, cache_dir=None, current_date=None):
+    """Convert one markdown file to its own HTML document; return the HTML filename"""
+    # Convert to HTML
+    html_content = convert_markdown(file_info['content'], cache_dir)
     
-    index_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{collection_title} - Index</title>
-    <style>
-        /* Academic index styling */
-        * {{
+    # Create HTML filename
+    html_filename = f"{file_info['stem']}.html"
+    html_path = output_dir / html_filename
+    
+    # Create complete HTML document
+    complete_html = create_html_document(html_content, file_info['title'], include_toc, current_date)
+    
+    # Save HTML file
+    html_path.write_text(complete_html, encoding='utf-8')
+    
+    return html_filename
+
+# Stylesheet of the index page
+_INDEX_CSS = """        /* Academic index styling */
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             line-height: 1.6;
             color: #000;
             background: #f5f5f5;
             padding: 40px 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             box-shadow: 0 0 20px rgba(0, 0, 0, 0.1);
             border-radius: 8px;
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: normal;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.2em;
             opacity: 0.9;
             font-style: italic;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .description {{
+        .description {
             font-size: 1.1em;
             margin-bottom: 40px;
             text-align: center;
             color: #555;
             line-height: 1.8;
-        }}
+        }
         
-        .documents-grid {{
+        .documents-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 30px;
             margin-top: 30px;
-        }}
+        }
         
-        .document-card {{
+        .document-card {
             border: 1px solid #ddd;
             border-radius: 8px;
             overflow: hidden;
             transition: transform 0.2s ease, box-shadow 0.2s ease;
             background: white;
-        }}
+        }
         
-        .document-card:hover {{
+        .document-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .document-card a {{
+        .document-card a {
             text-decoration: none;
             color: inherit;
             display: block;
-        }}
+        }
         
-        .card-header {{
+        .card-header {
             background: #f8f9fa;
             padding: 20px;
             border-bottom: 1px solid #dee2e6;
-        }}
+        }
         
-        .card-title {{
+        .card-title {
             font-size: 1.2em;
             font-weight: bold;
             margin-bottom: 8px;
             color: #2c3e50;
-        }}
+        }
         
-        .card-meta {{
+        .card-meta {
             font-size: 0.9em;
             color: #6c757d;
             margin-bottom: 5px;
-        }}
+        }
         
-        .card-stats {{
+        .card-stats {
             font-size: 0.8em;
             color: #868e96;
-        }}
+        }
         
-        .card-preview {{
+        .card-preview {
             padding: 20px;
             background: white;
             max-height: 150px;
             overflow: hidden;
             position: relative;
-        }}
+        }
         
-        .card-preview p {{
+        .card-preview p {
             margin: 0 0 10px 0;
             color: #555;
             line-height: 1.4;
-        }}
+        }
         
-        .card-preview::after {{
+        .card-preview::after {
             content: '';
             position: absolute;
             bottom: 0;
@@ -675,16 +759,16 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
             right: 0;
             height: 30px;
             background: linear-gradient(transparent, white);
-        }}
+        }
         
-        .card-footer {{
+        .card-footer {
             padding: 15px 20px;
             background: #f8f9fa;
             border-top: 1px solid #dee2e6;
             text-align: center;
-        }}
+        }
         
-        .read-more {{
+        .read-more {
             background: #3498db;
             color: white;
             padding: 8px 16px;
@@ -692,72 +776,79 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
             text-decoration: none;
             font-size: 0.9em;
             font-weight: 500;
-        }}
+        }
         
-        .read-more:hover {{
+        .read-more:hover {
             background: #2980b9;
             text-decoration: none;
             color: white;
-        }}
+        }
         
-        .stats {{
+        .stats {
             margin-top: 40px;
             padding: 20px;
             background: #f8f9fa;
             border-radius: 8px;
             text-align: center;
-        }}
+        }
         
-        .stats h3 {{
+        .stats h3 {
             margin-bottom: 15px;
             color: #2c3e50;
-        }}
+        }
         
-        .stat-item {{
+        .stat-item {
             display: inline-block;
             margin: 0 20px;
             padding: 10px;
-        }}
+        }
         
-        .stat-number {{
+        .stat-number {
             font-size: 2em;
             font-weight: bold;
             color: #3498db;
             display: block;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             font-size: 0.9em;
             color: #7f8c8d;
-        }}
+        }
         
-        .back-link {{
+        .back-link {
             margin-top: 30px;
             text-align: center;
-        }}
+        }
         
-        .back-link a {{
+        .back-link a {
             color: #3498db;
             text-decoration: none;
             font-weight: 500;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .documents-grid {{
+        @media (max-width: 768px) {
+            .documents-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .container {{
+            .container {
                 margin: 10px;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+"""
+
+# Rest of the index page head after the collection title; it starts like a document head
+_INDEX_HEAD_END = ' - Index</title>\n    <style>\n' + _INDEX_CSS + '    </style>\n</head>\n<body>'
+
+def create_index_html(documents_info, output_dir, collection_title="Markdown Documents Collection"):
+    """Create an index HTML file for all documents."""
+    
+    # The page is collected as a list of fragments and joined once at the end
+    parts = [f"""{_DOCUMENT_HEAD_START}{collection_title}{_INDEX_HEAD_END}
     <div class="container">
         <div class="header">
             <h1>{collection_title}</h1>
@@ -771,15 +862,14 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
                 and structured navigation.
             </div>
             
-            <div class="documents-grid">"""
+            <div class="documents-grid">"""]
 
-    # Calculate total words for all documents
-    total_words = sum(len(doc['content'].split()) for doc in documents_info)
+    # Count each document's words once, for its card and the collection total
+    word_counts = [len(doc['content'].split()) for doc in documents_info]
+    total_words = sum(word_counts)
     
     # Add each document card
-    for doc in documents_info:
-        word_count = len(doc['content'].split())
-        
+    for doc, word_count in zip(documents_info, word_counts):
         # Create a preview from the content (first paragraph or two)
         preview_content = doc['content'][:300] + "..." if len(doc['content']) > 300 else doc['content']
         # Convert basic markdown to text for preview
@@ -788,7 +878,7 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
         preview_text = re.sub(r'\*(.*?)\*', r'\1', preview_text)
         preview_text = re.sub(r'`([^`]+)`', r'\1', preview_text)
         
-        index_template += f"""
+        parts.append(f"""
                 <div class="document-card">
                     <a href="{doc['html_filename']}">
                         <div class="card-header">
@@ -803,9 +893,9 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
                     <div class="card-footer">
                         <a href="{doc['html_filename']}" class="read-more">Read Document →</a>
                     </div>
-                </div>"""
+                </div>""")
 
-    index_template += f"""
+    parts.append(f"""
             </div>
             
             <div class="stats">
@@ -826,9 +916,9 @@ def create_index_html(documents_info, output_dir, collection_title="Markdown Doc
         </div>
     </div>
 </body>
-</html>"""
+</html>""")
     
-    return index_template
+    return ''.join(parts)
 
 def main():
     """Main function to generate HTML file"""
@@ -839,6 +929,7 @@ def main():
     parser.add_argument('--output', '-o', help='Output directory or HTML filename (default: ./html_output/)')
     parser.add_argument('--no-toc', action='store_true', help='Disable table of contents generation')
     parser.add_argument('--title', help='Document title (default: derived from filename)')
+    parser.add_argument('--cache', action='store_true', help=f'Reuse HTML of unchanged markdown from earlier runs (kept in <output>/{_CACHE_DIR}/)')
     
     args = parser.parse_args()
     
@@ -867,6 +958,12 @@ def main():
     # Create output directory if it doesn't exist
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Rendered HTML is cached by content hash when --cache is given
+    cache_dir = None
+    if args.cache:
+        cache_dir = output_dir / _CACHE_DIR
+        cache_dir.mkdir(exist_ok=True)
+    
     if args.dir and args.separate:
         # Process directory with separate files + index
         print("\n📖 Reading markdown files for separate processing...")
@@ -880,24 +977,21 @@ def main():
         
         documents_info = []
         
-        for file_info in file_contents:
+        # Files are independent, so larger collections are converted in worker
+        # processes; map keeps the results in file order
+        convert = functools.partial(
+            write_separate_document, output_dir=output_dir, include_toc=not args.no_toc, cache_dir=cache_dir,
+            current_date=datetime.now().strftime(_DATE_FORMAT)
+        )
+        if len(file_contents) >= _PARALLEL_MIN_FILES:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor() as executor:
+                html_filenames = list(executor.map(convert, file_contents))
+        else:
+            html_filenames = list(map(convert, file_contents))
+        
+        for file_info, html_filename in zip(file_contents, html_filenames):
             print(f"📝 Processing: {file_info['name']}")
-            
-            # Convert to HTML
-            html_content = simple_markdown_to_html(file_info['content'])
-            
-            # Create HTML filename
-            html_filename = f"{file_info['stem']}.html"
-            html_path = output_dir / html_filename
-            
-            # Create complete HTML document
-            include_toc = not args.no_toc
-            complete_html = create_html_document(html_content, file_info['title'], include_toc)
-            
-            # Save HTML file
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(complete_html)
-            
             print(f"✅ Created: {html_filename}")
             
             # Store info for index
@@ -914,14 +1008,13 @@ def main():
         index_content = create_index_html(documents_info, output_dir, collection_title)
         index_path = output_dir / 'index.html'
         
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(index_content)
+        index_path.write_text(index_content, encoding='utf-8')
         
         print("✅ Created: index.html")
         
         # Summary
-        total_size = sum(os.path.getsize(output_dir / doc['html_filename']) for doc in documents_info)
-        total_size += os.path.getsize(index_path)
+        total_size = sum((output_dir / doc['html_filename']).stat().st_size for doc in documents_info)
+        total_size += index_path.stat().st_size
         
         print(f"\n🎉 Separate files with index generated successfully!")
         print(f"📄 Files created: {len(documents_info)} documents + 1 index")
@@ -939,7 +1032,7 @@ def main():
         
         # Convert to HTML
         print("\n🔄 Converting markdown to HTML...")
-        html_content = simple_markdown_to_html(markdown_content)
+        html_content = convert_markdown(markdown_content, cache_dir)
         
         # Determine title and output file path
         title = args.title or base_name.replace('-', ' ').replace('_', ' ').title()
@@ -953,10 +1046,9 @@ def main():
         complete_html = create_html_document(html_content, title, include_toc)
         
         # Save HTML file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(complete_html)
+        output_file.write_text(complete_html, encoding='utf-8')
         
-        file_size = os.path.getsize(output_file) / 1024
+        file_size = output_file.stat().st_size / 1024
         
         print(f"\n✅ Combined HTML file generated successfully: {output_file}")
         print(f"📄 File size: {file_size:.1f} KB")
@@ -973,7 +1065,7 @@ def main():
         
         # Convert to HTML
         print("\n🔄 Converting markdown to HTML...")
-        html_content = simple_markdown_to_html(markdown_content)
+        html_content = convert_markdown(markdown_content, cache_dir)
         
         # Determine title and output file path
         title = args.title or base_name.replace('-', ' ').replace('_', ' ').title()
@@ -991,10 +1083,9 @@ def main():
         complete_html = create_html_document(html_content, title, include_toc)
         
         # Save HTML file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(complete_html)
+        output_file.write_text(complete_html, encoding='utf-8')
         
-        file_size = os.path.getsize(output_file) / 1024
+        file_size = output_file.stat().st_size / 1024
         
         print(f"\n✅ HTML file generated successfully: {output_file}")
         print(f"📄 File size: {file_size:.1f} KB")
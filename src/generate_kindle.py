@@ -31,6 +31,7 @@ Transfer to Kindle:
     4. Cloud: Some newer Kindles support direct upload via web interface
 """
 
+import functools
 import os
 import re
 import sys
@@ -40,16 +41,26 @@ from datetime import datetime
 from ebooklib import epub
 import uuid
 
-def simple_markdown_to_html(markdown_content):
-    """Enhanced markdown to HTML conversion using regex"""
+# HTML special characters and their entities, including quotes for attribute values
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+
+# Markdown header lines: level markers and header text; the whitespace
+# after the markers may not run onto the next line
+_HEADER_RE = re.compile(r'^(#{1,6})[^\S\n]+(.+)$', re.MULTILINE)
+
+# Text of a level-1 heading, matched at a line start found with str.find
+_TITLE_RE = re.compile(r'# (.+)$', re.MULTILINE)
+
+def simple_markdown_to_html(markdown_content, anchor_prefix=""):
+    """Enhanced markdown to HTML conversion using regex; anchor_prefix is prepended to header IDs"""
     html = markdown_content
     
     # Convert headers (with IDs for table of contents)
-    html = re.sub(r'^# (.*?)$', lambda m: f'<h1 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h1>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.*?)$', lambda m: f'<h2 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^### (.*?)$', lambda m: f'<h3 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^#### (.*?)$', lambda m: f'<h4 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h4>', html, flags=re.MULTILINE)
-    html = re.sub(r'^##### (.*?)$', lambda m: f'<h5 id="{create_anchor_id(m.group(1))}">{m.group(1)}</h5>', html, flags=re.MULTILINE)
+    html = re.sub(r'^# (.*?)$', lambda m: f'<h1 id="{anchor_prefix}{create_anchor_id(m.group(1))}">{m.group(1)}</h1>', html, flags=re.MULTILINE)
+    html = re.sub(r'^## (.*?)$', lambda m: f'<h2 id="{anchor_prefix}{create_anchor_id(m.group(1))}">{m.group(1)}</h2>', html, flags=re.MULTILINE)
+    html = re.sub(r'^### (.*?)$', lambda m: f'<h3 id="{anchor_prefix}{create_anchor_id(m.group(1))}">{m.group(1)}</h3>', html, flags=re.MULTILINE)
+    html = re.sub(r'^#### (.*?)$', lambda m: f'<h4 id="{anchor_prefix}{create_anchor_id(m.group(1))}">{m.group(1)}</h4>', html, flags=re.MULTILINE)
+    html = re.sub(r'^##### (.*?)$', lambda m: f'<h5 id="{anchor_prefix}{create_anchor_id(m.group(1))}">{m.group(1)}</h5>', html, flags=re.MULTILINE)
     
     # Convert code blocks with language support
     html = re.sub(r'```(\w+)?\n(.*?)\n```', lambda m: f'<pre><code class="language-{m.group(1) or "text"}">{escape_html(m.group(2))}</code></pre>', html, flags=re.DOTALL)
@@ -97,6 +108,7 @@ def simple_markdown_to_html(markdown_content):
     
     return '\n\n'.join(html_paragraphs)
 
+@functools.lru_cache(maxsize=8192)
 def create_anchor_id(text):
     """Create a URL-friendly anchor ID from header text"""
     # Remove HTML tags and convert to lowercase
@@ -109,7 +121,7 @@ def create_anchor_id(text):
 
 def escape_html(text):
     """Escape HTML special characters"""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 def wrap_list_items(match):
     """Wrap list items in appropriate ul or ol tags"""
@@ -180,23 +192,26 @@ def convert_tables(html):
 
 def extract_title_from_content(content):
     """Extract the first heading as title"""
-    match = re.search(r'^# (.+)$', content, re.MULTILINE)
-    if match:
-        return match.group(1).strip()
+    # Jump between candidate line starts instead of trying the regex at every offset
+    at_start = content.startswith('# ')
+    pos = 0 if at_start else content.find('\n# ') + 1
+    while at_start or pos:
+        match = _TITLE_RE.match(content, pos)
+        if match:
+            return match.group(1).strip()
+        at_start = False
+        pos = content.find('\n# ', pos) + 1
     return "Document"
 
 def extract_headers_for_toc(content):
     """Extract headers for table of contents"""
     headers = []
-    lines = content.split('\n')
     
-    for line in lines:
-        match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if match:
-            level = len(match.group(1))
-            title = match.group(2).strip()
-            anchor_id = create_anchor_id(title)
-            headers.append((level, title, anchor_id))
+    for match in _HEADER_RE.finditer(content):
+        level = len(match.group(1))
+        title = match.group(2).strip()
+        anchor_id = create_anchor_id(title)
+        headers.append((level, title, anchor_id))
     
     return headers
 
@@ -390,8 +405,11 @@ em {
 }
 """
 
-def create_epub_book(markdown_files, output_filename, book_title=None, author="Generated Document"):
-    """Create an EPUB book from markdown files"""
+# The Kindle stylesheet is static, so build it once at import
+_KINDLE_STYLES = create_kindle_styles()
+
+def create_epub_book(markdown_files, output_filename, book_title=None, author="Generated Document", chapter_titles=None):
+    """Create an EPUB book from markdown files, optionally with their chapter titles already worked out"""
     
     # Create the book
     book = epub.EpubBook()
@@ -411,7 +429,7 @@ def create_epub_book(markdown_files, output_filename, book_title=None, author="G
         uid="style_default",
         file_name="style/default.css",
         media_type="text/css",
-        content=create_kindle_styles()
+        content=_KINDLE_STYLES
     )
     book.add_item(style)
     
@@ -426,9 +444,12 @@ def create_epub_book(markdown_files, output_filename, book_title=None, author="G
         print(f"📝 Processing chapter {i+1}: {Path(file_path).name} ({len(content)} chars)")
             
         # Extract title from content or filename
-        chapter_title = extract_title_from_content(content)
-        if chapter_title == "Document":
-            chapter_title = Path(file_path).stem.replace('-', ' ').replace('_', ' ').title()
+        if chapter_titles is not None:
+            chapter_title = chapter_titles[i]
+        else:
+            chapter_title = extract_title_from_content(content)
+            if chapter_title == "Document":
+                chapter_title = Path(file_path).stem.replace('-', ' ').replace('_', ' ').title()
         
         print(f"📑 Chapter title: {chapter_title}")
         